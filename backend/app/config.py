@@ -1,6 +1,10 @@
-from pydantic_settings import BaseSettings
+from functools import lru_cache
+
+from pydantic_settings import BaseSettings, SettingsConfigDict
 
 class Settings(BaseSettings):
+    model_config = SettingsConfigDict(env_file=".env", frozen=True, extra="ignore")
+
     MONGO_URI: str
     DB_NAME: str
     SECRET_KEY: str
@@ -19,7 +23,10 @@ class Settings(BaseSettings):
     GEMINI_API_KEY: str = ""
     COINGECKO_API_KEY: str = ""
 
-    class Config:
-        env_file = ".env"
 
-settings = Settings()
+@lru_cache
+def get_settings() -> Settings:
+    """Settings are parsed from the environment/.env once per process."""
+    return Settings()
+
+settings = get_settings()
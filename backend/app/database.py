@@ -1,22 +1,67 @@
-from motor.motor_asyncio import AsyncIOMotorClient
-from .config import settings
+import logging
+from typing import Optional
+
+from motor.motor_asyncio import AsyncIOMotorClient, AsyncIOMotorDatabase
+from .config import get_settings
+
+settings = get_settings()
+logger = logging.getLogger(__name__)
+
+# Process-wide Motor client; created lazily and shared by every request
+_client: Optional[AsyncIOMotorClient] = None
 
-class Database:
-    client: AsyncIOMotorClient = None
 
+def _get_client() -> AsyncIOMotorClient:
+    global _client
+    if _client is None:
+        _client = AsyncIOMotorClient(
+            settings.MONGO_URI,
+            maxPoolSize=100,
+            minPoolSize=10,
+            uuidRepresentation="standard",
+        )
+    return _client
+
+
+class Database:
     def connect_db(self):
-        self.client = AsyncIOMotorClient(settings.MONGO_URI)
-        print("Connected to MongoDB via Motor.")
+        _get_client()
+        logger.info("Connected to MongoDB via Motor.")
 
     def close_db(self):
-        if self.client:
-            self.client.close()
-            print("Closed MongoDB connection.")
+        global _client
+        if _client:
+            _client.close()
+            _client = None
+            logger.info("Closed MongoDB connection.")
+
+    def get_db(self) -> AsyncIOMotorDatabase:
+        return _get_client()[settings.DB_NAME]
 
-    def get_db(self):
-        return self.client[settings.DB_NAME]
+    async def ensure_indexes(self):
+        # Unique lookups used by login and registration, the per-user portfolio
+        # lookup, plus TTL indexes that let Mongo prune expired OTP and cached
+        # forecast documents. Each index is created on its own, so one failure
+        # (e.g. existing duplicates) is logged without skipping the rest
+        database = self.get_db()
+        indexes = [
+            (database.users, "username", {"unique": True}),
+            (database.users, "email", {"unique": True}),
+            # Also serves plain {"user_id": ...} queries through its prefix
+            (database.portfolio, [("user_id", 1), ("coin_symbol", 1)], {}),
+            (database.pending_registrations, "created_at", {"expireAfterSeconds": 600}),
+            (database.password_resets, "created_at", {"expireAfterSeconds": 900}),
+            (database.forecast_cache, "fetched_at", {"expireAfterSeconds": 3600}),
+        ]
+        for collection, keys, options in indexes:
+            try:
+                await collection.create_index(keys, **options)
+            except Exception:
+                logger.exception("Could not create index %s on %s", keys, collection.name)
 
 db = Database()
 
-async def get_database():
+# Kept as a coroutine on purpose: FastAPI awaits async dependencies inline,
+# whereas plain `def` dependencies are dispatched to its threadpool
+async def get_database() -> AsyncIOMotorDatabase:
     return db.get_db()
@@ -0,0 +1,41 @@
+from typing import Optional
+
+import httpx
+
+try:
+    import h2  # noqa: F401
+    HTTP2_AVAILABLE = True
+except ImportError:
+    HTTP2_AVAILABLE = False
+
+# Per-endpoint timeouts (seconds) for Binance REST calls, plus the NewsData API
+HTTP_TIMEOUTS = {
+    "exchangeInfo": 15.0,
+    "ticker/24hr": 10.0,
+    "ticker/price": 10.0,
+    "ticker": 10.0,
+    "klines": 10.0,
+    "news": 10.0,
+}
+
+# Process-wide outbound client; pooled connections (multiplexed over HTTP/2 when
+# h2 is installed) are reused across requests instead of a new handshake per call
+_client: Optional[httpx.AsyncClient] = None
+
+
+def get_http_client() -> httpx.AsyncClient:
+    global _client
+    if _client is None:
+        _client = httpx.AsyncClient(
+            http2=HTTP2_AVAILABLE,
+            timeout=httpx.Timeout(15.0),
+            limits=httpx.Limits(max_connections=100, max_keepalive_connections=50),
+        )
+    return _client
+
+
+async def close_http_client():
+    global _client
+    if _client is not None:
+        await _client.aclose()
+        _client = None
@@ -0,0 +1,96 @@
+"""
+Local on-disk cache helpers for the intelligence module.
+Files are stored under backend/.cache so repeated runs can skip network and training work.
+"""
+
+import hashlib
+import os
+import threading
+import time
+from collections import OrderedDict
+
+import numpy as np
+
+CACHE_DIR = os.path.abspath(
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), "../../.cache")
+)
+
+
+def cache_path(prefix: str, *key_parts, ext: str) -> str:
+    """Build a cache file path whose name is a short hash of the key parts."""
+    digest = hashlib.blake2b(repr(key_parts).encode(), digest_size=8).hexdigest()
+    os.makedirs(CACHE_DIR, exist_ok=True)
+    return os.path.join(CACHE_DIR, f"{prefix}_{digest}.{ext}")
+
+
+def is_fresh(path: str, max_age_seconds: float) -> bool:
+    """Return True if the file exists and was written within max_age_seconds."""
+    try:
+        return time.time() - os.path.getmtime(path) < max_age_seconds
+    except OSError:
+        return False
+
+
+def prune_cache(prefix: str, max_files: int) -> None:
+    """
+    Keep only the max_files most recently used cache files with this prefix,
+    deleting the rest (oldest modification time first).
+    """
+    try:
+        entries = [e for e in os.scandir(CACHE_DIR) if e.name.startswith(f"{prefix}_")]
+    except OSError:
+        return
+    if len(entries) <= max_files:
+        return
+    
+    def mtime(entry):
+        try:
+            return entry.stat().st_mtime
+        except OSError:
+            return 0.0
+    
+    entries.sort(key=mtime, reverse=True)
+    for entry in entries[max_files:]:
+        try:
+            os.remove(entry.path)
+        except OSError:
+            pass
+
+
+def touch(path: str) -> None:
+    """Mark a cache file as recently used so pruning keeps it."""
+    try:
+        os.utime(path)
+    except OSError:
+        pass
+
+
+def series_key(prices, *extra) -> str:
+    """Stable hash of a price series (as float64) plus any extra parameters."""
+    h = hashlib.blake2b(digest_size=16)
+    h.update(np.ascontiguousarray(prices, dtype=np.float64).tobytes())
+    h.update(repr(extra).encode())
+    return h.hexdigest()
+
+
+class LRUCache:
+    """Small thread-safe in-process LRU mapping, used to keep fitted models around."""
+
+    def __init__(self, maxsize: int = 32):
+        self.maxsize = maxsize
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            value = self._data.get(key)
+            if value is not None:
+                self._data.move_to_end(key)
+            return value
+
+    def put(self, key, value):
+        with self._lock:
+            self._data[key] = value
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
@@ -0,0 +1,216 @@
+"""
+Optional Numba support and shared numeric kernels.
+`njit` compiles with Numba when it is installed and otherwise returns the plain Python function,
+so numeric kernels keep working (just slower) without the dependency.
+"""
+
+import numpy as np
+
+try:
+    from numba import njit as _numba_njit
+except ImportError:
+    _numba_njit = None
+
+NUMBA_AVAILABLE = _numba_njit is not None
+
+
+def njit(*args, **kwargs):
+    """Drop-in for numba.njit supporting both @njit and @njit(...) forms."""
+    if _numba_njit is not None:
+        return _numba_njit(*args, **kwargs)
+
+    if len(args) == 1 and callable(args[0]) and not kwargs:
+        return args[0]
+
+    def decorator(func):
+        return func
+    return decorator
+
+
+@njit(cache=True)
+def ema(x: np.ndarray, span: int) -> np.ndarray:
+    """
+    Exponential moving average matching pandas' `Series.ewm(span=span).mean()` (adjust=True).
+    Uses the recursive form of the normalised weights: num/den with both decayed by (1 - alpha).
+    NaNs are skipped but still age older weights (pandas' ignore_na=False); output is NaN
+    only before the first observation.
+    """
+    n = x.shape[0]
+    out = np.empty(n)
+    decay = 1.0 - 2.0 / (span + 1.0)
+    num = 0.0
+    den = 0.0
+    for i in range(n):
+        num = decay * num
+        den = decay * den
+        if not np.isnan(x[i]):
+            num += x[i]
+            den += 1.0
+        out[i] = num / den if den > 0.0 else np.nan
+    return out
+
+
+@njit(cache=True, fastmath=True)
+def forecast_metrics(actual: np.ndarray, predicted: np.ndarray):
+    """Return (MAE, RMSE, MAPE %) of a forecast in a single pass over both arrays."""
+    n = actual.shape[0]
+    s_abs = 0.0
+    s_sq = 0.0
+    s_pct = 0.0
+    for i in range(n):
+        d = actual[i] - predicted[i]
+        ad = abs(d)
+        s_abs += ad
+        s_sq += d * d
+        s_pct += ad / abs(actual[i])
+    return s_abs / n, np.sqrt(s_sq / n), 100.0 * s_pct / n
+
+
+@njit(cache=True)
+def price_feature_row(prices: np.ndarray, i: int, out: np.ndarray) -> None:
+    """
+    Fill the price-derived XGBoost feature columns for index i (requires i >= 21).
+    Column order: lag_1/3/7/14/21, sma_7, ema_7, sma_14, ema_14, sma_21, ema_21,
+    momentum_7/14, volatility_7/14, returns_1/7, price_to_sma7/14.
+    The EMA columns (6, 8, 10) span the whole history and are left to the caller.
+    """
+    price = prices[i]
+    
+    out[0] = prices[i - 1]
+    out[1] = prices[i - 3]
+    out[2] = prices[i - 7]
+    out[3] = prices[i - 14]
+    out[4] = prices[i - 21]
+    
+    # Trailing sums over the 7/14/21-day windows ending at i
+    s7 = 0.0
+    s14 = 0.0
+    s21 = 0.0
+    for k in range(21):
+        x = prices[i - k]
+        if k < 7:
+            s7 += x
+        if k < 14:
+            s14 += x
+        s21 += x
+    sma_7 = s7 / 7.0
+    sma_14 = s14 / 14.0
+    out[5] = sma_7
+    out[7] = sma_14
+    out[9] = s21 / 21.0
+    
+    out[11] = price - prices[i - 7]
+    out[12] = price - prices[i - 14]
+    
+    # Sample standard deviations (ddof=1), two-pass about the window mean
+    q7 = 0.0
+    q14 = 0.0
+    for k in range(14):
+        x = prices[i - k]
+        if k < 7:
+            q7 += (x - sma_7) * (x - sma_7)
+        q14 += (x - sma_14) * (x - sma_14)
+    out[13] = np.sqrt(q7 / 6.0)
+    out[14] = np.sqrt(q14 / 13.0)
+    
+    out[15] = price / prices[i - 1] - 1.0
+    out[16] = price / prices[i - 7] - 1.0
+    out[17] = price / sma_7
+    out[18] = price / sma_14
+
+
+@njit(cache=True)
+def rolling_mean_std(x: np.ndarray, w: int, out_mean: np.ndarray, out_std: np.ndarray) -> None:
+    """
+    Trailing w-window mean and sample std (ddof=1) from running sums, O(1) per step.
+    Entries before the first full window are left untouched. Values are centred on
+    the first finite x before summing to limit cancellation in the sum of squares.
+    NaNs are kept out of the sums and counted instead, so (as with pandas rolling)
+    only windows that contain a NaN come out NaN.
+    """
+    n = x.shape[0]
+    if n == 0:
+        return
+    shift = 0.0
+    for i in range(n):
+        if not np.isnan(x[i]):
+            shift = x[i]
+            break
+    s = 0.0
+    ss = 0.0
+    missing = 0
+    for i in range(n):
+        if np.isnan(x[i]):
+            missing += 1
+        else:
+            v = x[i] - shift
+            s += v
+            ss += v * v
+        if i >= w:
+            if np.isnan(x[i - w]):
+                missing -= 1
+            else:
+                old = x[i - w] - shift
+                s -= old
+                ss -= old * old
+        if i >= w - 1:
+            if missing > 0:
+                out_mean[i] = np.nan
+                out_std[i] = np.nan
+            else:
+                out_mean[i] = s / w + shift
+                var = (ss - s * s / w) / (w - 1)
+                out_std[i] = np.sqrt(var) if var > 0.0 else 0.0
+
+
+@njit(cache=True)
+def price_features(prices: np.ndarray, out: np.ndarray) -> None:
+    """
+    Fill the price-derived feature columns of every complete row (i >= 21) of out,
+    in the same layout as `price_feature_row`.
+    """
+    n = prices.shape[0]
+    
+    # SMA and volatility columns from one running-sum pass per window
+    mean = np.empty(n)
+    std = np.empty(n)
+    for w, mean_col, std_col in ((7, 5, 13), (14, 7, 14), (21, 9, -1)):
+        rolling_mean_std(prices, w, mean, std)
+        for i in range(21, n):
+            out[i, mean_col] = mean[i]
+            if std_col >= 0:
+                out[i, std_col] = std[i]
+    
+    for i in range(21, n):
+        price = prices[i]
+        out[i, 0] = prices[i - 1]
+        out[i, 1] = prices[i - 3]
+        out[i, 2] = prices[i - 7]
+        out[i, 3] = prices[i - 14]
+        out[i, 4] = prices[i - 21]
+        out[i, 11] = price - prices[i - 7]
+        out[i, 12] = price - prices[i - 14]
+        out[i, 15] = price / prices[i - 1] - 1.0
+        out[i, 16] = price / prices[i - 7] - 1.0
+        out[i, 17] = price / out[i, 5]
+        out[i, 18] = price / out[i, 7]
+
+
+def training_rows(features: np.ndarray, prices: np.ndarray) -> np.ndarray:
+    """
+    Indices of rows usable for next-day training: every feature present and a
+    non-NaN next-day price (so the final row is never included).
+    """
+    valid = ~np.isnan(features).any(axis=1)
+    valid[-1] = False
+    valid[:-1] &= ~np.isnan(prices[1:])
+    return np.flatnonzero(valid)
+
+
+def ema_denominators(prices: np.ndarray, decay: np.ndarray) -> np.ndarray:
+    """
+    Denominators of the adjust=True EMA after the last price, one per decay factor:
+    the sum of decay**age over the observed (non-NaN) days, matching the `ema` kernel.
+    """
+    ages = np.arange(len(prices) - 1, -1, -1)
+    return (decay[:, None] ** ages) @ ~np.isnan(prices)
@@ -5,6 +5,7 @@ import pandas as pd
 import numpy as np
 import yfinance as yf
 from datetime import datetime, timedelta
+from concurrent.futures import ProcessPoolExecutor
 import warnings
 
 # Add parent dir to path to import app modules
@@ -14,10 +15,52 @@ sys.path.append(backend_dir)
 
 try:
     from app.intelligence.forecast import generate_forecast
+    from app.intelligence._cache import cache_path, is_fresh
+    from app.intelligence._njit import forecast_metrics
 except ImportError:
     print("Error: Could not import generate_forecast. Make sure you are running from the backend directory or have pythonpath set.")
     sys.exit(1)
 
+# Cached downloads are reused for 6 hours to keep intraday data reasonably fresh
+DOWNLOAD_CACHE_TTL = 6 * 3600
+
+
+def _cached_download(symbol, start, end):
+    """yf.download with a local pickle cache keyed by (symbol, start date, end date)."""
+    path = cache_path("yf", symbol, start.date().isoformat(), end.date().isoformat(), ext="pkl")
+    
+    if is_fresh(path, DOWNLOAD_CACHE_TTL):
+        try:
+            return pd.read_pickle(path)
+        except Exception as e:
+            print(f"Ignoring unreadable cache file {path}: {e}")
+    
+    data = yf.download(symbol, start=start, end=end, progress=False)
+    if data is not None and not data.empty:
+        data.to_pickle(path)
+    return data
+
+
+def _one_run(train_data, actual_future, days_to_predict):
+    """
+    Forecast from train_data and score it against actual_future.
+    Top-level so it can be shipped to worker processes.
+    Returns (mae, rmse, mape, last_actual, last_pred), or None if no forecast was produced.
+    """
+    # Note: generate_forecast might print "Prophet failed" or similar warnings
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore")
+        forecast = generate_forecast(train_data, days=days_to_predict)
+    
+    if not forecast:
+        return None
+    
+    # MAE/RMSE/MAPE over the whole 7-day curve; the last day is also returned
+    # for a point comparison
+    mae, rmse, mape = forecast_metrics(actual_future, np.asarray(forecast, dtype=np.float64))
+    return mae, rmse, mape, float(actual_future[-1]), forecast[-1]
+
+
 def evaluate_model(symbol="BTC-USD", days_to_predict=7, test_samples=5):
     print(f"\n--- Starting Evaluation for {symbol} ---")
     
@@ -27,14 +70,16 @@ def evaluate_model(symbol="BTC-USD", days_to_predict=7, test_samples=5):
     start_date = end_date - timedelta(days=365)
     
     try:
-        data = yf.download(symbol, start=start_date, end=end_date, progress=False)
+        data = _cached_download(symbol, start_date, end_date)
         if hasattr(data, "columns") and isinstance(data.columns, pd.MultiIndex):
              # Handle new yfinance format if needed, though 'Close' usually works directly
-             prices = data["Close"].iloc[:, 0].tolist() # Take first column if multi-index
+             close = data["Close"].iloc[:, 0] # Take first column if multi-index
         else:
-             prices = data["Close"].tolist()
+             close = data["Close"]
+        # One contiguous array; training/actual windows below are slices (views) of it
+        prices = close.to_numpy(dtype=np.float64)
              
-        if not prices:
+        if prices.size == 0:
             print("Error: No data fetched.")
             return
             
@@ -45,9 +90,10 @@ def evaluate_model(symbol="BTC-USD", days_to_predict=7, test_samples=5):
         return
 
     # 2. Run Rolling Evaluation
-    maes = []
-    rmses = []
-    mapes = []
+    maes = np.empty(test_samples)
+    rmses = np.empty(test_samples)
+    mapes = np.empty(test_samples)
+    completed = 0
     
     # We will pick 'test_samples' random start points in the last 60 days to test
     # ensuring we have at least 7 days of "future" data for each point.
@@ -62,51 +108,40 @@ def evaluate_model(symbol="BTC-USD", days_to_predict=7, test_samples=5):
     print(f"{'Run':<5} | {'Actual Price (Day 7)':<25} | {'Predicted (Day 7)':<20} | {'Error %':<10}")
     print("-" * 75)
     
-    for i, idx in enumerate(indices):
-        # Train data: everything up to idx
-        train_data = prices[:idx]
+    # Each run trains its own models independently, so spread them across processes.
+    # map() yields results in submission order, keeping the table ordered by run.
+    workers = max(1, min(test_samples, os.cpu_count() or 1))
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        results = executor.map(
+            _one_run,
+            [prices[:idx] for idx in indices],
+            [prices[idx : idx + days_to_predict] for idx in indices],
+            [days_to_predict] * len(indices),
+        )
         
-        # Actual future data
-        actual_future = prices[idx : idx + days_to_predict]
-        
-        # Generate Forecast
-        # Note: generate_forecast might print "Prophet failed" or similar warnings
-        with warnings.catch_warnings():
-            warnings.simplefilter("ignore")
-            # We assume generate_forecast handles 7 days by default or we pass it
-            forecast = generate_forecast(train_data, days=days_to_predict)
+        for i, result in enumerate(results):
+            if result is None:
+                print(f"Run {i+1}: No forecast generated.")
+                continue
             
-        if not forecast:
-            print(f"Run {i+1}: No forecast generated.")
-            continue
+            mae, rmse, mape, last_actual, last_pred = result
+            maes[completed] = mae
+            rmses[completed] = rmse
+            mapes[completed] = mape
+            completed += 1
             
-        # Compare
-        # We focus on the last day (Day 7) for a point-comparison, 
-        # but MAE/RMSE should be over the whole 7-day curve.
-        
-        # Metrics for this sample (7-day horizon)
-        sample_mae = np.mean(np.abs(np.array(actual_future) - np.array(forecast)))
-        sample_rmse = np.sqrt(np.mean((np.array(actual_future) - np.array(forecast))**2))
-        sample_mape = np.mean(np.abs((np.array(actual_future) - np.array(forecast)) / np.array(actual_future))) * 100
-        
-        maes.append(sample_mae)
-        rmses.append(sample_rmse)
-        mapes.append(sample_mape)
-        
-        last_actual = actual_future[-1]
-        last_pred = forecast[-1]
-        error_pct = abs((last_actual - last_pred) / last_actual) * 100
-        
-        print(f"{i+1:<5} | ${last_actual:<23.2f} | ${last_pred:<18.2f} | {error_pct:<8.2f}%")
+            error_pct = abs((last_actual - last_pred) / last_actual) * 100
+            
+            print(f"{i+1:<5} | ${last_actual:<23.2f} | ${last_pred:<18.2f} | {error_pct:<8.2f}%")
 
     # 3. Aggregate Results
-    if not maes:
+    if completed == 0:
         print("\nNo successful runs.")
         return
 
-    avg_mae = np.mean(maes)
-    avg_rmse = np.mean(rmses)
-    avg_mape = np.mean(mapes)
+    avg_mae = maes[:completed].mean()
+    avg_rmse = rmses[:completed].mean()
+    avg_mape = mapes[:completed].mean()
 
     # Write to file
     with open("results.txt", "w", encoding="utf-8") as f:
@@ -8,20 +8,80 @@ Fallback: Prophet (MAPE: 4.22%)
 Secondary Fallback: Exponential smoothing
 """
 
+import os
+import threading
 import pandas as pd
 import numpy as np
-from typing import List, Tuple
+from typing import List, Tuple, Union
 import warnings
 
+try:
+    import xgboost as xgb
+except ImportError:
+    xgb = None
+
+from ._cache import LRUCache, cache_path, prune_cache, series_key, touch
+from ._njit import njit, ema, ema_denominators, training_rows
+
+# Feature layout shared by XGBoost training and iterative prediction
+_LAGS = (1, 3, 7, 14, 21)
+_WINDOWS = (7, 14, 21)
+_WARMUP = 21  # Longest lag/window; earlier rows have incomplete features
+
+FEATURE_COLS = (
+    [f'lag_{lag}' for lag in _LAGS]
+    + [f'{kind}_{w}' for w in _WINDOWS for kind in ('sma', 'ema')]
+    + ['momentum_7', 'momentum_14', 'volatility_7', 'volatility_14',
+       'returns_1', 'returns_7', 'price_to_sma7', 'price_to_sma14']
+)
+
+_XGB_PARAMS = dict(
+    tree_method='hist',  # Histogram splits (xgboost < 2.0 defaults to exact on CPU)
+    n_jobs=-1,
+    n_estimators=100,
+    max_depth=6,
+    learning_rate=0.1,
+    subsample=0.8,
+    colsample_bytree=0.8,
+    random_state=42,
+    verbosity=0
+)
+
+# Fitted XGBoost models keyed by a hash of the training series, so repeated
+# forecasts on identical data (e.g. backtests) skip retraining
+_XGB_CACHE = LRUCache(maxsize=32)
+# Live price series change on nearly every request, so the on-disk copies are
+# capped and the least recently used files are deleted
+_XGB_DISK_MAX_FILES = 64
+
+# Prophet hyperparameters tuned for crypto
+_PROPHET_PARAMS = dict(
+    daily_seasonality=True,         # Crypto trades 24/7
+    weekly_seasonality=True,        # Weekend effects
+    yearly_seasonality=True,
+    changepoint_prior_scale=0.25,   # More flexible for volatile markets
+    seasonality_prior_scale=15.0,   # Stronger seasonality
+    seasonality_mode='multiplicative',  # Better for volatile assets
+    changepoint_range=0.9,          # Allow changes near end of data
+    n_changepoints=30,              # More change points
+)
+# Custom monthly seasonality (hourly patterns matter less for daily data)
+_PROPHET_MONTHLY = dict(name='monthly', period=30.5, fourier_order=5)
 
-def _calculate_scale_factor(prices: List[float]) -> float:
+# Fitted Prophet models, keyed like _XGB_CACHE (plus the date the series ends on)
+_PROPHET_CACHE = LRUCache(maxsize=32)
+# Capped like the XGBoost files; serialised Prophet models are larger still
+_PROPHET_DISK_MAX_FILES = 32
+
+
+def _calculate_scale_factor(prices: np.ndarray) -> float:
     """
     Calculate optimal scale factor for low-value coins.
     Scales prices to a range that models can process accurately.
     
     Returns scale factor (1 if no scaling needed).
     """
-    if not prices:
+    if len(prices) == 0:
         return 1.0
     
     avg_price = np.mean(prices)
@@ -41,17 +101,30 @@ def _calculate_scale_factor(prices: List[float]) -> float:
     return scale_factor
 
 
-def _scale_prices(prices: List[float], scale_factor: float) -> List[float]:
+def _scale_prices(prices: np.ndarray, scale_factor: float) -> np.ndarray:
     """Scale prices up by the given factor."""
-    return [p * scale_factor for p in prices]
+    return np.asarray(prices, dtype=np.float64) * scale_factor
 
 
-def _descale_prices(prices: List[float], scale_factor: float) -> List[float]:
+def _descale_prices(prices: np.ndarray, scale_factor: float) -> np.ndarray:
     """Descale prices back to original magnitude."""
-    return [p / scale_factor for p in prices]
+    return np.asarray(prices, dtype=np.float64) / scale_factor
+
+
+def _anchor(predictions: np.ndarray, current_price: float) -> np.ndarray:
+    """Shift predictions in place so the forecast starts at the current price."""
+    predictions += current_price - predictions[0]
+    return predictions
 
 
-def generate_forecast(prices: List[float], days: int = 7) -> List[float]:
+def _finalize_forecast(forecast, scale_factor: float) -> List[float]:
+    """Undo any low-value scaling and convert to a plain list for the API boundary."""
+    if scale_factor > 1:
+        forecast = _descale_prices(forecast, scale_factor)
+    return np.asarray(forecast, dtype=np.float64).tolist()
+
+
+def generate_forecast(prices: Union[List[float], np.ndarray], days: int = 7) -> List[float]:
     """
     Takes a list of historical prices and returns a forecast.
     Uses XGBoost as primary, Ensemble as fallback, LSTM as final.
@@ -59,17 +132,18 @@ def generate_forecast(prices: List[float], days: int = 7) -> List[float]:
     Automatically handles low-value coins (like SHIB, PEPE) with dynamic scaling.
     
     Args:
-        prices: List of historical float prices.
+        prices: Historical float prices (list or 1-D array).
         days: Number of days to forecast.
 
     Returns:
         List of forecasted prices.
     """
-    if not prices:
+    prices = np.asarray(prices, dtype=np.float64)
+    if len(prices) == 0:
         return []
     
     if len(prices) < 30:  # Need enough data for LSTM lookback
-        return _simple_fallback(prices, days)
+        return _finalize_forecast(_simple_fallback(prices, days), 1.0)
     
     # Calculate scale factor for low-value coins
     scale_factor = _calculate_scale_factor(prices)
@@ -85,177 +159,348 @@ def generate_forecast(prices: List[float], days: int = 7) -> List[float]:
     try:
         forecast = _xgboost_forecast(scaled_prices, days)
         # Descale if we scaled earlier
-        return _descale_prices(forecast, scale_factor) if scale_factor > 1 else forecast
+        return _finalize_forecast(forecast, scale_factor)
     except Exception as e:
         print(f"XGBoost failed, trying Ensemble: {e}")
     
     # Fallback to Ensemble (3.54% MAPE)
     try:
         forecast = _ensemble_forecast(scaled_prices, days)
-        return _descale_prices(forecast, scale_factor) if scale_factor > 1 else forecast
+        return _finalize_forecast(forecast, scale_factor)
     except Exception as e:
         print(f"Ensemble failed, trying LSTM: {e}")
     
     # Final fallback - LSTM (4.20% MAPE)
     try:
         forecast = _lstm_forecast(scaled_prices, days)
-        return _descale_prices(forecast, scale_factor) if scale_factor > 1 else forecast
+        return _finalize_forecast(forecast, scale_factor)
     except Exception as e:
         print(f"LSTM failed, using simple fallback: {e}")
         forecast = _simple_fallback(scaled_prices, days)
-        return _descale_prices(forecast, scale_factor) if scale_factor > 1 else forecast
+        return _finalize_forecast(forecast, scale_factor)
+
 
+def warm_up() -> None:
+    """
+    Compile the numeric kernels ahead of the first forecast request. XGBoost is
+    loaded with this module; TensorFlow (only used by the last-resort LSTM) is left
+    to load on demand.
+    """
+    prices = np.linspace(100.0, 110.0, _WARMUP + 2)
+    _build_features_np(prices)
+    _simple_fallback(prices, 2)
 
 
-def _xgboost_forecast(prices: List[float], days: int) -> List[float]:
+def _build_features_np(prices: np.ndarray) -> np.ndarray:
     """
-    XGBoost-based forecasting with feature engineering.
-    Best performing model (MAPE: 2.83%).
+    Create lagged features and technical indicators as an (N, len(FEATURE_COLS)) array.
+    Rows without a full lookback window are NaN, like the pandas version they replace.
     """
-    import xgboost as xgb
-    
-    def create_features(prices_arr: np.ndarray) -> pd.DataFrame:
-        """Create lagged features and technical indicators."""
-        df = pd.DataFrame({'price': prices_arr})
-        
-        # Lagged features
-        for lag in [1, 3, 7, 14, 21]:
-            df[f'lag_{lag}'] = df['price'].shift(lag)
-        
-        # Moving averages
-        for window in [7, 14, 21]:
-            df[f'sma_{window}'] = df['price'].rolling(window=window).mean()
-            df[f'ema_{window}'] = df['price'].ewm(span=window).mean()
-        
-        # Momentum
-        df['momentum_7'] = df['price'] - df['price'].shift(7)
-        df['momentum_14'] = df['price'] - df['price'].shift(14)
-        
-        # Volatility
-        df['volatility_7'] = df['price'].rolling(window=7).std()
-        df['volatility_14'] = df['price'].rolling(window=14).std()
-        
-        # Returns
-        df['returns_1'] = df['price'].pct_change(1)
-        df['returns_7'] = df['price'].pct_change(7)
-        
-        # Price ratios
-        df['price_to_sma7'] = df['price'] / df['sma_7']
-        df['price_to_sma14'] = df['price'] / df['sma_14']
-        
-        return df
-    
-    # Create features
-    df = create_features(np.array(prices))
-    df = df.dropna()
-    
-    # Target is next day's price
-    df['target'] = df['price'].shift(-1)
-    df = df.dropna()
-    
-    # Split features and target
-    feature_cols = [c for c in df.columns if c not in ['price', 'target']]
-    X = df[feature_cols].values
-    y = df['target'].values
-    
-    # Train XGBoost
-    model = xgb.XGBRegressor(
-        n_estimators=100,
-        max_depth=6,
-        learning_rate=0.1,
-        subsample=0.8,
-        colsample_bytree=0.8,
-        random_state=42,
-        verbosity=0
-    )
+    n = len(prices)
+    out = np.full((n, len(FEATURE_COLS)), np.nan)
+    col = 0
+    
+    # Lagged features
+    for lag in _LAGS:
+        out[lag:, col] = prices[:-lag]
+        col += 1
+    
+    # Rolling sums from one pair of cumulative sums, reused by every window.
+    # Prices are centred on the first observed value to limit cancellation error.
+    # NaNs are summed as zero and counted separately, so only windows that
+    # actually contain a NaN come out NaN (as with pandas rolling)
+    missing = np.isnan(prices)
+    shift = prices[~missing][0] if not missing.all() else 0.0
+    centred = prices - shift
+    cs = np.concatenate(([0.0], np.nancumsum(centred)))
+    cs2 = np.concatenate(([0.0], np.nancumsum(centred * centred)))
+    cnan = np.concatenate(([0], np.cumsum(missing)))
+    
+    def window_sums(window):
+        has_nan = (cnan[window:] - cnan[:-window]) > 0
+        total = np.where(has_nan, np.nan, cs[window:] - cs[:-window])
+        total_sq = np.where(has_nan, np.nan, cs2[window:] - cs2[:-window])
+        return total, total_sq
+    
+    # Moving averages
+    sma = {}
+    for window in _WINDOWS:
+        total, _ = window_sums(window)
+        sma[window] = np.full(n, np.nan)
+        sma[window][window - 1:] = total / window + shift
+        out[:, col] = sma[window]
+        out[:, col + 1] = ema(prices, window)
+        col += 2
+    
+    # Momentum
+    out[7:, col] = prices[7:] - prices[:-7]
+    out[14:, col + 1] = prices[14:] - prices[:-14]
+    
+    # Volatility (sample std, as pandas rolling().std())
+    for k, window in enumerate((7, 14)):
+        total, total_sq = window_sums(window)
+        var = (total_sq - total * total / window) / (window - 1)
+        out[window - 1:, col + 2 + k] = np.sqrt(np.maximum(var, 0.0))
+    
+    # Returns
+    out[1:, col + 4] = prices[1:] / prices[:-1] - 1
+    out[7:, col + 5] = prices[7:] / prices[:-7] - 1
+    
+    # Price ratios
+    out[:, col + 6] = prices / sma[7]
+    out[:, col + 7] = prices / sma[14]
+    
+    return out
+
+
+def _build_last_feature_row(prices: np.ndarray, ema_last: np.ndarray, out: np.ndarray) -> np.ndarray:
+    """
+    Fill `out` with the final row of `_build_features_np(prices)` and return it.
+    The EMAs depend on the full history, so the caller passes their latest values
+    (one per window in _WINDOWS); everything else looks back at most _WARMUP days.
+    """
+    last = prices[-1]
+    sma_7 = prices[-7:].mean()
+    sma_14 = prices[-14:].mean()
+    
+    col = 0
+    for lag in _LAGS:
+        out[col] = prices[-1 - lag]
+        col += 1
+    for k, window in enumerate(_WINDOWS):
+        out[col] = prices[-window:].mean()
+        out[col + 1] = ema_last[k]
+        col += 2
+    
+    out[col] = last - prices[-8]
+    out[col + 1] = last - prices[-15]
+    out[col + 2] = prices[-7:].std(ddof=1)
+    out[col + 3] = prices[-14:].std(ddof=1)
+    out[col + 4] = last / prices[-2] - 1
+    out[col + 5] = last / prices[-8] - 1
+    out[col + 6] = last / sma_7
+    out[col + 7] = last / sma_14
+    
+    return out
+
+
+def _fit_xgboost(prices_arr: np.ndarray):
+    """
+    Train (or fetch a cached) XGBoost model on the given price series.
+    Models are cached in-process and persisted to a size-capped disk cache for
+    reuse across runs.
+    """
+    if xgb is None:
+        raise ImportError("xgboost is not installed")
+    
+    key = series_key(prices_arr, _XGB_PARAMS)
+    model = _XGB_CACHE.get(key)
+    if model is not None:
+        return model
+    
+    model = xgb.XGBRegressor(**_XGB_PARAMS)
+    path = cache_path("xgb", key, ext="json")
+    
+    if os.path.exists(path):
+        try:
+            model.load_model(path)
+            touch(path)
+            _XGB_CACHE.put(key, model)
+            return model
+        except Exception as e:
+            print(f"Ignoring unreadable XGBoost cache {path}: {e}")
+    
+    # Create features and drop incomplete rows; the target is the next day's price,
+    # so rows whose next day is missing (including the final row) are excluded as well
+    features = _build_features_np(prices_arr)
+    rows = training_rows(features, prices_arr)
+    
+    X = features[rows]
+    y = prices_arr[rows + 1]
     
     model.fit(X, y)
     
-    # Predict iteratively
-    predictions = []
-    current_prices = list(prices)
+    try:
+        model.save_model(path)
+        prune_cache("xgb", _XGB_DISK_MAX_FILES)
+    except Exception as e:
+        print(f"Could not persist XGBoost model: {e}")
     
-    for _ in range(days):
-        temp_df = create_features(np.array(current_prices))
-        temp_df = temp_df.dropna()
+    _XGB_CACHE.put(key, model)
+    return model
+
+
+def _xgboost_forecast(prices: np.ndarray, days: int) -> np.ndarray:
+    """
+    XGBoost-based forecasting with feature engineering.
+    Best performing model (MAPE: 2.83%).
+    """
+    prices_arr = np.asarray(prices, dtype=np.float64)
+    n = len(prices_arr)
+    
+    model = _fit_xgboost(prices_arr)
+    booster = model.get_booster()
+    
+    # EMA state in the recursive adjust=True form: ema = num / den, where
+    # den is the sum of the decay factors over the observed (non-NaN) days
+    decay = np.array([1.0 - 2.0 / (w + 1.0) for w in _WINDOWS])
+    ema_den = ema_denominators(prices_arr, decay)
+    ema_num = np.array([ema(prices_arr, w)[-1] for w in _WINDOWS]) * ema_den
+    
+    # Predict iteratively, appending each prediction to a preallocated price buffer.
+    # inplace_predict on a reused float32 row skips DMatrix construction per step.
+    predictions = np.empty(days)
+    current_prices = np.empty(n + days)
+    current_prices[:n] = prices_arr
+    feature_row = np.empty((1, len(FEATURE_COLS)), dtype=np.float32)
+    
+    for step in range(days):
+        history = current_prices[:n + step]
+        
+        if len(history) <= _WARMUP:
+            next_pred = float(history[-1])
+        else:
+            _build_last_feature_row(history, ema_num / ema_den, feature_row[0])
+            next_pred = float(booster.inplace_predict(feature_row)[0])
+        predictions[step] = next_pred
+        current_prices[n + step] = next_pred
         
-        if len(temp_df) == 0:
-            predictions.append(current_prices[-1])
-            continue
-            
-        last_features = temp_df[feature_cols].iloc[-1:].values
-        next_pred = float(model.predict(last_features)[0])
-        predictions.append(next_pred)
-        current_prices.append(next_pred)
+        ema_num = next_pred + decay * ema_num
+        ema_den = 1.0 + decay * ema_den
     
     # Anchor to current price to connect forecast with historical chart
-    current_price = prices[-1]
-    predicted_start = predictions[0]
-    offset = current_price - predicted_start
-    predictions = [p + offset for p in predictions]
-    
-    return predictions
+    return _anchor(predictions, prices[-1])
 
 
-def _prophet_forecast(prices: List[float], days: int) -> List[float]:
+def fit_prophet(prices):
     """
-    Prophet-based forecasting with optimized hyperparameters.
-    Fallback model (MAPE: 4.22%).
+    Fit (or fetch a cached) Prophet model on a daily price series ending today.
+    Models are cached in-process and persisted to a size-capped disk cache for
+    reuse across runs.
     """
+    import prophet
     from prophet import Prophet
+    from prophet.serialize import model_from_json, model_to_json
+    
+    prices_arr = np.asarray(prices, dtype=np.float64)
+    
+    # Dates are anchored to midnight so the same series maps to the same model all day
+    end = pd.Timestamp.now().normalize()
+    key = series_key(prices_arr, end.isoformat(), _PROPHET_PARAMS, _PROPHET_MONTHLY, prophet.__version__)
+    model = _PROPHET_CACHE.get(key)
+    if model is not None:
+        return model
     
-    # Create DataFrame with dates
-    dates = pd.date_range(end=pd.Timestamp.now(), periods=len(prices))
-    df = pd.DataFrame({'ds': dates, 'y': prices})
+    path = cache_path("prophet", key, ext="json")
     
-    # Optimized hyperparameters
-    model = Prophet(
-        daily_seasonality=True,
-        weekly_seasonality=True,
-        yearly_seasonality=True,
-        changepoint_prior_scale=0.25,
-        seasonality_prior_scale=15.0,
-        seasonality_mode='multiplicative',
-        changepoint_range=0.9,
-        n_changepoints=30,
-    )
+    if os.path.exists(path):
+        try:
+            with open(path) as f:
+                model = model_from_json(f.read())
+            touch(path)
+            _PROPHET_CACHE.put(key, model)
+            return model
+        except Exception as e:
+            print(f"Ignoring unreadable Prophet cache {path}: {e}")
     
-    model.add_seasonality(name='monthly', period=30.5, fourier_order=5)
+    dates = pd.date_range(end=end, periods=len(prices_arr))
+    df = pd.DataFrame({'ds': dates, 'y': prices_arr})
+    
+    model = Prophet(**_PROPHET_PARAMS)
+    model.add_seasonality(**_PROPHET_MONTHLY)
     
     with warnings.catch_warnings():
         warnings.simplefilter("ignore")
         model.fit(df)
     
+    try:
+        with open(path, "w") as f:
+            f.write(model_to_json(model))
+        prune_cache("prophet", _PROPHET_DISK_MAX_FILES)
+    except Exception as e:
+        print(f"Could not persist Prophet model: {e}")
+    
+    _PROPHET_CACHE.put(key, model)
+    return model
+
+
+def _prophet_forecast(prices: np.ndarray, days: int) -> np.ndarray:
+    """
+    Prophet-based forecasting with optimized hyperparameters.
+    Fallback model (MAPE: 4.22%).
+    """
+    model = fit_prophet(prices)
+    
     future = model.make_future_dataframe(periods=days)
     forecast = model.predict(future)
     
-    predictions = forecast.tail(days)['yhat'].tolist()
+    predictions = forecast.tail(days)['yhat'].to_numpy(dtype=np.float64)
     
     # Anchor to current price
-    current = prices[-1]
-    offset = current - predictions[0]
-    predictions = [p + offset for p in predictions]
+    return _anchor(predictions, prices[-1])
+
+
+def _build_lstm(lookback: int, dtype: str = 'float32'):
+    from tensorflow.keras.models import Sequential
+    from tensorflow.keras.layers import LSTM, Dense, Dropout
     
-    return predictions
+    return Sequential([
+        LSTM(64, return_sequences=True, input_shape=(lookback, 1), dtype=dtype),
+        Dropout(0.2, dtype=dtype),
+        LSTM(32, return_sequences=False, dtype=dtype),
+        Dropout(0.2, dtype=dtype),
+        Dense(16, activation='relu', dtype=dtype),
+        Dense(1, dtype=dtype)
+    ])
+
+
+# One inference model and compiled rollout per (lookback, dtype). Each forecast
+# copies its freshly trained weights in, so the graph is traced once rather than
+# per call; the lock keeps concurrent forecasts from swapping weights mid-rollout.
+_LSTM_ROLLOUTS = {}
+_LSTM_ROLLOUT_LOCK = threading.Lock()
+
+
+def _lstm_rollout(lookback: int, dtype: str):
+    import tensorflow as tf
+    
+    cached = _LSTM_ROLLOUTS.get((lookback, dtype))
+    if cached is not None:
+        return cached
+    
+    infer_model = _build_lstm(lookback, dtype)
+    
+    # The whole rollout runs as a single compiled graph (the Python loop becomes
+    # a tf.while_loop) instead of one predict() per day
+    @tf.function(reduce_retracing=True)
+    def rollout(init_seq, n_steps):
+        outputs = tf.TensorArray(init_seq.dtype, size=n_steps)
+        seq = init_seq
+        for i in tf.range(n_steps):
+            next_pred = infer_model(seq, training=False)
+            outputs = outputs.write(i, next_pred[0, 0])
+            seq = tf.concat([seq[:, 1:, :], tf.reshape(next_pred, (1, 1, 1))], axis=1)
+        return outputs.stack()
+    
+    _LSTM_ROLLOUTS[(lookback, dtype)] = (infer_model, rollout)
+    return infer_model, rollout
 
 
-def _lstm_forecast(prices: List[float], days: int, lookback: int = 30) -> List[float]:
+def _lstm_forecast(prices: np.ndarray, days: int, lookback: int = 30) -> np.ndarray:
     """
     LSTM Deep Learning model for sequence prediction.
     Final fallback (MAPE: 4.20%).
     """
     import tensorflow as tf
-    from tensorflow.keras.models import Sequential
-    from tensorflow.keras.layers import LSTM, Dense, Dropout
-    from sklearn.preprocessing import MinMaxScaler
     
     # Suppress TF logs
     tf.get_logger().setLevel('ERROR')
     
-    # Scale data
-    data = np.array(prices).reshape(-1, 1)
-    scaler = MinMaxScaler(feature_range=(0, 1))
-    scaled_data = scaler.fit_transform(data)
+    # Min-max scale to [0, 1] (a flat series maps to 0, as MinMaxScaler does)
+    lo = prices.min()
+    rng = (prices.max() - lo) or 1.0
+    scaled_data = np.subtract(prices, lo)
+    scaled_data /= rng
     
     # Create sequences
     def create_sequences(data_arr, lb):
@@ -265,46 +510,36 @@ def _lstm_forecast(prices: List[float], days: int, lookback: int = 30) -> List[f
             y.append(data_arr[i])
         return np.array(X), np.array(y)
     
-    X, y = create_sequences(scaled_data.flatten(), lookback)
+    X, y = create_sequences(scaled_data, lookback)
     X = X.reshape((X.shape[0], X.shape[1], 1))
     
-    # Build LSTM model
-    model = Sequential([
-        LSTM(64, return_sequences=True, input_shape=(lookback, 1)),
-        Dropout(0.2),
-        LSTM(32, return_sequences=False),
-        Dropout(0.2),
-        Dense(16, activation='relu'),
-        Dense(1)
-    ])
-    
+    # Train in float32 for numerical stability
+    model = _build_lstm(lookback)
     model.compile(optimizer='adam', loss='mse')
     model.fit(X, y, epochs=50, batch_size=16, verbose=0)
     
-    # Predict future days
-    predictions = []
-    current_sequence = scaled_data[-lookback:].flatten()
+    # Run inference on a float16 copy when a GPU is available (half the weight
+    # bandwidth, tensor-core math). CPUs have no native float16 arithmetic, so
+    # inference stays in float32 there.
+    infer_dtype = 'float16' if tf.config.list_physical_devices('GPU') else 'float32'
+    weights = [w.astype(infer_dtype) for w in model.get_weights()]
+    init_seq = tf.constant(scaled_data[-lookback:].reshape((1, lookback, 1)), dtype=infer_dtype)
     
-    for _ in range(days):
-        input_seq = current_sequence.reshape((1, lookback, 1))
-        next_pred = model.predict(input_seq, verbose=0)[0, 0]
-        predictions.append(next_pred)
-        current_sequence = np.append(current_sequence[1:], next_pred)
+    with _LSTM_ROLLOUT_LOCK:
+        infer_model, rollout = _lstm_rollout(lookback, infer_dtype)
+        infer_model.set_weights(weights)
+        predictions = rollout(init_seq, tf.constant(days)).numpy()
     
     # Inverse transform
-    predictions = scaler.inverse_transform(
-        np.array(predictions).reshape(-1, 1)
-    ).flatten().tolist()
+    predictions = predictions.astype(np.float64)
+    predictions *= rng
+    predictions += lo
     
     # Anchor to current price to connect forecast with historical chart
-    current_price = prices[-1]
-    predicted_start = predictions[0]
-    offset = current_price - predicted_start
-    predictions = [p + offset for p in predictions]
-    
-    return predictions
+    return _anchor(predictions, prices[-1])
+
 
-def _ensemble_forecast(prices: List[float], days: int) -> List[float]:
+def _ensemble_forecast(prices: np.ndarray, days: int) -> np.ndarray:
     """
     Ensemble model combining multiple forecasts.
     Fallback model (MAPE: 3.54%).
@@ -334,7 +569,7 @@ def _ensemble_forecast(prices: List[float], days: int) -> List[float]:
             trace=False,
             n_fits=10
         )
-        arima_pred = model.predict(n_periods=days).tolist()
+        arima_pred = np.asarray(model.predict(n_periods=days), dtype=np.float64)
         predictions_list.append(arima_pred)
         weights.append(0.35)
     except:
@@ -349,61 +584,73 @@ def _ensemble_forecast(prices: List[float], days: int) -> List[float]:
         pass
     
     if not predictions_list:
-        return [prices[-1]] * days
-    
-    # Normalize weights
-    total_weight = sum(weights[:len(predictions_list)])
-    weights = [w / total_weight for w in weights[:len(predictions_list)]]
-    
-    # Weighted average
-    ensemble = []
-    for day in range(days):
-        day_pred = sum(
-            predictions_list[i][day] * weights[i]
-            for i in range(len(predictions_list))
-        )
-        ensemble.append(day_pred)
+        return np.full(days, prices[-1], dtype=np.float64)
+    
+    # Weighted average as a single matrix-vector product over the (models, days) stack
+    stack = np.array(predictions_list, dtype=np.float64)
+    w = np.array(weights, dtype=np.float64)
+    w /= w.sum()
+    ensemble = w @ stack
     
     # Anchor to current price to connect forecast with historical chart
-    current_price = prices[-1]
-    predicted_start = ensemble[0]
-    offset = current_price - predicted_start
-    ensemble = [p + offset for p in ensemble]
+    return _anchor(ensemble, prices[-1])
+
+
+@njit(cache=True)
+def _simple_fallback_kernel(recent: np.ndarray, weights: np.ndarray,
+                            days: int, current_price: float) -> np.ndarray:
+    """Weighted linear trend over `recent`, extrapolated with damping and clamping."""
+    # Closed-form weighted least squares slope, accumulated in a single pass.
+    # np.polyfit applies w to the unsquared residuals, so the effective weights are w**2.
+    sw = 0.0
+    sx = 0.0
+    sy = 0.0
+    sxx = 0.0
+    sxy = 0.0
+    for i in range(recent.shape[0]):
+        w = weights[i] * weights[i]
+        x = float(i)
+        sw += w
+        sx += w * x
+        sy += w * recent[i]
+        sxx += w * x * x
+        sxy += w * x * recent[i]
+    
+    denom = sw * sxx - sx * sx
+    slope = (sw * sxy - sx * sy) / denom if denom != 0.0 else 0.0
+    slope *= 0.6  # Dampen
+    
+    lower = current_price * 0.8
+    upper = current_price * 1.2
+    forecast = np.empty(days)
+    last_price = current_price
+    
+    for i in range(days):
+        next_price = last_price + slope * (1 - 0.05 * i)
+        next_price = max(next_price, lower)
+        next_price = min(next_price, upper)
+        forecast[i] = next_price
+        last_price = next_price
     
-    return ensemble
+    return forecast
 
 
-def _simple_fallback(prices: List[float], days: int) -> List[float]:
+def _simple_fallback(prices: np.ndarray, days: int) -> np.ndarray:
     """
     Simple exponential smoothing fallback for edge cases.
     Used when primary models fail or insufficient data.
     """
     if len(prices) < 2:
-        return [prices[-1]] * days
+        return np.full(days, prices[-1], dtype=np.float64)
     
-    current_price = prices[-1]
+    current_price = float(prices[-1])
     window = min(14, len(prices))
-    recent_prices = prices[-window:]
+    recent_prices = np.asarray(prices[-window:], dtype=np.float64)
     
-    # Weighted trend calculation
-    x = np.arange(len(recent_prices))
-    weights = np.exp(np.linspace(0, 1, len(recent_prices)))
-    coefficients = np.polyfit(x, recent_prices, 1, w=weights)
-    slope = coefficients[0] * 0.6  # Dampen
+    # Weighted trend calculation (more weight on recent prices)
+    weights = np.exp(np.linspace(0, 1, window))
     
-    # Generate forecast
-    forecast = []
-    last_price = current_price
-    
-    for i in range(days):
-        trend_change = slope * (1 - 0.05 * i)
-        next_price = last_price + trend_change
-        next_price = max(next_price, current_price * 0.8)
-        next_price = min(next_price, current_price * 1.2)
-        forecast.append(next_price)
-        last_price = next_price
-    
-    return forecast
+    return _simple_fallback_kernel(recent_prices, weights, days, current_price)
 
 
 def _calculate_moving_average(prices: List[float], window: int = 7) -> float:
@@ -15,11 +15,22 @@ import os
 import sys
 import warnings
 import time
+from concurrent.futures import ProcessPoolExecutor
 from datetime import datetime, timedelta
 from typing import List, Dict, Tuple, Optional
 import numpy as np
 import pandas as pd
 
+try:
+    import xgboost as xgb
+except ImportError:
+    xgb = None
+
+try:
+    import yfinance as yf
+except ImportError:
+    yf = None
+
 # Suppress warnings for cleaner output
 warnings.filterwarnings('ignore')
 os.environ['TF_CPP_MIN_LOG_LEVEL'] = '3'  # Suppress TensorFlow logs
@@ -29,23 +40,25 @@ current_dir = os.path.dirname(os.path.abspath(__file__))
 backend_dir = os.path.abspath(os.path.join(current_dir, "../../"))
 sys.path.append(backend_dir)
 
+from app.intelligence._cache import cache_path, is_fresh, prune_cache, series_key, touch
+from app.intelligence._njit import (
+    ema, ema_denominators, forecast_metrics, price_feature_row, price_features, training_rows,
+)
+
 
 class ModelEvaluator:
     """Base class with common evaluation utilities."""
     
-    def __init__(self, prices: List[float], test_days: int = 7):
-        self.prices = np.array(prices)
+    def __init__(self, prices: np.ndarray, test_days: int = 7):
+        self.prices = np.asarray(prices, dtype=np.float64)
         self.test_days = test_days
         
     def calculate_metrics(self, actual: np.ndarray, predicted: np.ndarray) -> Dict[str, float]:
         """Calculate MAE, RMSE, and MAPE."""
-        actual = np.array(actual)
-        predicted = np.array(predicted)
-        
-        mae = np.mean(np.abs(actual - predicted))
-        rmse = np.sqrt(np.mean((actual - predicted) ** 2))
-        mape = np.mean(np.abs((actual - predicted) / actual)) * 100
-        
+        mae, rmse, mape = forecast_metrics(
+            np.asarray(actual, dtype=np.float64),
+            np.asarray(predicted, dtype=np.float64)
+        )
         return {"MAE": mae, "RMSE": rmse, "MAPE": mape}
 
 
@@ -59,36 +72,13 @@ class EnhancedProphetModel:
         self.model = None
         self.name = "Enhanced Prophet"
         
-    def fit_predict(self, train_prices: List[float], days: int = 7) -> List[float]:
+    def fit_predict(self, train_prices: np.ndarray, days: int = 7) -> List[float]:
         try:
-            from prophet import Prophet
-            
-            # Create DataFrame with dates
-            dates = pd.date_range(end=pd.Timestamp.now(), periods=len(train_prices))
-            df = pd.DataFrame({'ds': dates, 'y': train_prices})
-            
-            # Optimized hyperparameters for crypto
-            self.model = Prophet(
-                daily_seasonality=True,         # Crypto trades 24/7
-                weekly_seasonality=True,        # Weekend effects
-                yearly_seasonality=True,        
-                changepoint_prior_scale=0.25,   # More flexible for volatile markets
-                seasonality_prior_scale=15.0,   # Stronger seasonality
-                seasonality_mode='multiplicative',  # Better for volatile assets
-                changepoint_range=0.9,          # Allow changes near end of data
-                n_changepoints=30,              # More change points
-            )
+            from app.intelligence.forecast import fit_prophet
             
-            # Add custom crypto seasonality (hourly patterns matter less for daily)
-            self.model.add_seasonality(
-                name='monthly',
-                period=30.5,
-                fourier_order=5
-            )
-            
-            with warnings.catch_warnings():
-                warnings.simplefilter("ignore")
-                self.model.fit(df)
+            # Same crypto-tuned hyperparameters as the production forecaster;
+            # fitted models are cached by series, so repeated backtests skip refitting
+            self.model = fit_prophet(train_prices)
             
             future = self.model.make_future_dataframe(periods=days)
             forecast = self.model.predict(future)
@@ -117,7 +107,7 @@ class ARIMAModel:
         self.model = None
         self.name = "ARIMA"
         
-    def fit_predict(self, train_prices: List[float], days: int = 7) -> List[float]:
+    def fit_predict(self, train_prices: np.ndarray, days: int = 7) -> List[float]:
         try:
             from pmdarima import auto_arima
             
@@ -164,7 +154,7 @@ class LSTMModel:
             y.append(data[i])
         return np.array(X), np.array(y)
     
-    def fit_predict(self, train_prices: List[float], days: int = 7) -> List[float]:
+    def fit_predict(self, train_prices: np.ndarray, days: int = 7) -> List[float]:
         try:
             import tensorflow as tf
             from tensorflow.keras.models import Sequential
@@ -175,7 +165,7 @@ class LSTMModel:
             tf.get_logger().setLevel('ERROR')
             
             # Scale data
-            data = np.array(train_prices).reshape(-1, 1)
+            data = np.asarray(train_prices, dtype=np.float64).reshape(-1, 1)
             self.scaler = MinMaxScaler(feature_range=(0, 1))
             scaled_data = self.scaler.fit_transform(data)
             
@@ -198,15 +188,23 @@ class LSTMModel:
             # Train (silent)
             self.model.fit(X, y, epochs=50, batch_size=16, verbose=0)
             
-            # Predict future days iteratively
+            # Predict future days iteratively, keeping the rolling window in a
+            # ring buffer (head = oldest value) instead of reallocating it each step
             predictions = []
-            current_sequence = scaled_data[-self.lookback:].flatten()
+            lookback = self.lookback
+            window = np.empty(lookback, dtype=np.float32)
+            window[:] = scaled_data[-lookback:].flatten()
+            input_seq = np.empty((1, lookback, 1), dtype=np.float32)
+            head = 0
             
             for _ in range(days):
-                input_seq = current_sequence.reshape((1, self.lookback, 1))
+                # Unroll the ring buffer oldest-first into the reusable input tensor
+                input_seq[0, :lookback - head, 0] = window[head:]
+                input_seq[0, lookback - head:, 0] = window[:head]
                 next_pred = self.model.predict(input_seq, verbose=0)[0, 0]
                 predictions.append(next_pred)
-                current_sequence = np.append(current_sequence[1:], next_pred)
+                window[head] = next_pred
+                head = (head + 1) % lookback
             
             # Inverse transform
             predictions = self.scaler.inverse_transform(
@@ -230,85 +228,146 @@ class XGBoostModel:
         self.model = None
         self.name = "XGBoost"
         
-    def _create_features(self, prices: np.ndarray) -> pd.DataFrame:
-        """Create lagged features and technical indicators."""
-        df = pd.DataFrame({'price': prices})
-        
-        # Lagged features
-        for lag in [1, 3, 7, 14, 21]:
-            df[f'lag_{lag}'] = df['price'].shift(lag)
-        
-        # Moving averages
-        for window in [7, 14, 21]:
-            df[f'sma_{window}'] = df['price'].rolling(window=window).mean()
-            df[f'ema_{window}'] = df['price'].ewm(span=window).mean()
-        
-        # Price momentum
-        df['momentum_7'] = df['price'] - df['price'].shift(7)
-        df['momentum_14'] = df['price'] - df['price'].shift(14)
-        
-        # Volatility (rolling std)
-        df['volatility_7'] = df['price'].rolling(window=7).std()
-        df['volatility_14'] = df['price'].rolling(window=14).std()
-        
-        # Returns
-        df['returns_1'] = df['price'].pct_change(1)
-        df['returns_7'] = df['price'].pct_change(7)
+    feature_cols = [
+        'lag_1', 'lag_3', 'lag_7', 'lag_14', 'lag_21',
+        'sma_7', 'ema_7', 'sma_14', 'ema_14', 'sma_21', 'ema_21',
+        'momentum_7', 'momentum_14', 'volatility_7', 'volatility_14',
+        'returns_1', 'returns_7', 'price_to_sma7', 'price_to_sma14',
+    ]
+    ema_cols = (6, 8, 10)  # ema_7, ema_14, ema_21
+    
+    def _create_features(self, prices: np.ndarray) -> np.ndarray:
+        """
+        Create lagged features and technical indicators as an (N, 19) array in
+        `feature_cols` order. The first 21 rows lack a full lookback and are NaN.
+        """
+        out = np.full((len(prices), len(self.feature_cols)), np.nan)
+        price_features(prices, out)
         
-        # Price ratios
-        df['price_to_sma7'] = df['price'] / df['sma_7']
-        df['price_to_sma14'] = df['price'] / df['sma_14']
+        for col, window in zip(self.ema_cols, (7, 14, 21)):
+            out[21:, col] = ema(prices, window)[21:]
         
-        return df
+        return out
     
-    def fit_predict(self, train_prices: List[float], days: int = 7) -> List[float]:
+    def _last_row_features(self, prices: np.ndarray, ema_last: np.ndarray,
+                           out: np.ndarray) -> np.ndarray:
+        """
+        Write the features of the final row into `out` (in `feature_cols` order) and return it.
+        The EMAs span the whole history, so they are passed in.
+        """
+        price_feature_row(prices, len(prices) - 1, out)
+        for col, value in zip(self.ema_cols, ema_last):
+            out[col] = value
+        return out
+    
+    # Hyperparameters of a from-scratch fit; also part of the booster cache key
+    params = dict(
+        n_estimators=100,
+        tree_method="hist",
+        max_bin=256,
+        max_depth=6,
+        learning_rate=0.1,
+        subsample=0.8,
+        colsample_bytree=0.8,
+        random_state=42,
+        verbosity=0,
+    )
+    
+    # New trees added when warm-starting from a previous fit on overlapping data
+    warm_start_trees = 20
+    
+    # Each rolling evaluation window is cached under its own key; keep the most
+    # recently used files and delete the rest
+    disk_cache_max_files = 64
+    
+    def _load_cached(self, path: str) -> bool:
+        """Load a booster saved by an earlier fit into self.model, if one exists."""
+        if not os.path.exists(path):
+            return False
         try:
-            import xgboost as xgb
-            
-            # Create features
-            df = self._create_features(np.array(train_prices))
-            df = df.dropna()
-            
-            # Target is next day's price
-            df['target'] = df['price'].shift(-1)
-            df = df.dropna()
-            
-            # Split features and target
-            feature_cols = [c for c in df.columns if c not in ['price', 'target']]
-            X = df[feature_cols].values
-            y = df['target'].values
-            
-            # Train XGBoost
-            self.model = xgb.XGBRegressor(
-                n_estimators=100,
-                max_depth=6,
-                learning_rate=0.1,
-                subsample=0.8,
-                colsample_bytree=0.8,
-                random_state=42,
-                verbosity=0
-            )
-            
-            self.model.fit(X, y)
-            
-            # Predict iteratively
-            predictions = []
-            current_prices = list(train_prices)
-            
-            for _ in range(days):
-                # Get features for last sequence
-                temp_df = self._create_features(np.array(current_prices))
-                temp_df = temp_df.dropna()
-                
-                if len(temp_df) == 0:
-                    predictions.append(current_prices[-1])
+            self.model.load_model(path)
+            touch(path)
+            return True
+        except Exception as e:
+            print(f"Ignoring unreadable XGBoost cache {path}: {e}")
+            return False
+    
+    def fit_predict(self, train_prices: np.ndarray, days: int = 7,
+                    warm_start_booster=None) -> List[float]:
+        """
+        Train and forecast `days` ahead. If `warm_start_booster` (a fit on an earlier,
+        overlapping window) is given, training continues from it with a few extra trees
+        instead of starting from scratch.
+        """
+        try:
+            if xgb is None:
+                raise ImportError("xgboost is not installed")
+            
+            # Create features and keep complete rows (from index 21 on) whose target,
+            # the next day's price, exists; NaN closes drop only the rows they touch.
+            # Features are built in float64 and handed to XGBoost as float32.
+            prices = np.asarray(train_prices, dtype=np.float64)
+            features = self._create_features(prices)
+            rows = training_rows(features, prices)
+            X = features[rows].astype(np.float32)
+            y = prices[rows + 1].astype(np.float32)
+            
+            # Train XGBoost, or load the booster a previous run fitted on the same
+            # prices. Warm-started fits depend on the previous booster, so they
+            # always train and are not cached.
+            if warm_start_booster is None:
+                key = series_key(prices, self.params)
+                path = cache_path("xgbcmp", key, ext="json")
+                self.model = xgb.XGBRegressor(**self.params)
+                if not self._load_cached(path):
+                    self.model.fit(X, y)
+                    try:
+                        self.model.save_model(path)
+                        prune_cache("xgbcmp", self.disk_cache_max_files)
+                    except Exception as e:
+                        print(f"Could not persist XGBoost model: {e}")
+            else:
+                self.model = xgb.XGBRegressor(
+                    **{**self.params, "n_estimators": self.warm_start_trees}
+                )
+                self.model.fit(X, y, xgb_model=warm_start_booster)
+            booster = self.model.get_booster()
+            
+            # Predict iteratively. Each step only needs the last row of features, so it
+            # is computed from a view of a preallocated price buffer into a reused row;
+            # the EMAs are carried forward in their recursive (adjust=True) num/den form.
+            # Steps go straight to the booster with inplace_predict, skipping the sklearn
+            # wrapper's input checks and the DMatrix that `predict` would build per row.
+            n = len(train_prices)
+            current_prices = np.empty(n + days)
+            current_prices[:n] = prices
+            predictions = np.empty(days)
+            feature_row = np.empty((1, len(self.feature_cols)), dtype=np.float32)
+            
+            spans = np.array([7.0, 14.0, 21.0])
+            decay = 1.0 - 2.0 / (spans + 1.0)
+            ema_den = ema_denominators(prices, decay)
+            ema_num = features[-1, list(self.ema_cols)] * ema_den
+            ema_last = np.empty(3)
+            
+            for step in range(days):
+                if n < 22:
+                    # Not enough history for a complete feature row
+                    predictions[step] = current_prices[n - 1]
                     continue
-                    
-                last_features = temp_df[feature_cols].iloc[-1:].values
-                next_pred = self.model.predict(last_features)[0]
-                predictions.append(next_pred)
-                current_prices.append(next_pred)
-            
+                
+                np.divide(ema_num, ema_den, out=ema_last)
+                self._last_row_features(current_prices[:n], ema_last, feature_row[0])
+                next_pred = float(booster.inplace_predict(feature_row)[0])
+                predictions[step] = next_pred
+                current_prices[n] = next_pred
+                n += 1
+                ema_num *= decay
+                ema_num += next_pred
+                ema_den *= decay
+                ema_den += 1.0
+            
+            predictions = predictions.tolist()
             return predictions
             
         except Exception as e:
@@ -327,7 +386,7 @@ class EnsembleModel:
         self.weights = {}
         self.name = "Ensemble"
         
-    def fit_predict(self, train_prices: List[float], days: int = 7,
+    def fit_predict(self, train_prices: np.ndarray, days: int = 7,
                     model_predictions: Dict[str, List[float]] = None) -> List[float]:
         """
         Combine predictions from multiple models using inverse-error weighting.
@@ -350,19 +409,19 @@ class EnsembleModel:
                 xgb_model = XGBoostModel()
                 model_predictions['XGBoost'] = xgb_model.fit_predict(train_prices, days)
             
-            # Equal weighting (can be optimized with validation data)
-            n_models = len(model_predictions)
-            weights = {name: 1.0 / n_models for name in model_predictions}
+            # Equal weighting (can be optimized with validation data).
+            # Stack into a (models, days) matrix, NaN-padding any short forecast
+            # so missing days are averaged over the models that cover them.
+            M = np.full((len(model_predictions), days), np.nan)
+            for row, preds in enumerate(model_predictions.values()):
+                preds = np.asarray(preds[:days], dtype=np.float64)
+                M[row, :len(preds)] = preds
             
-            # Weighted average
-            predictions = []
-            for day in range(days):
-                day_pred = sum(
-                    model_predictions[name][day] * weights[name]
-                    for name in model_predictions
-                    if day < len(model_predictions[name])
-                )
-                predictions.append(day_pred)
+            # Average with an explicit count so a day no model covers stays
+            # NaN without numpy's "Mean of empty slice" warning.
+            counts = np.count_nonzero(~np.isnan(M), axis=0)
+            sums = np.nansum(M, axis=0)
+            predictions = np.where(counts > 0, sums / np.maximum(counts, 1), np.nan).tolist()
             
             return predictions
             
@@ -374,29 +433,93 @@ class EnsembleModel:
 # ============================================================================
 # MAIN COMPARISON RUNNER
 # ============================================================================
-def fetch_historical_data(symbol: str = "BTC-USD", days: int = 365) -> List[float]:
-    """Fetch historical price data using yfinance."""
-    import yfinance as yf
+# Cached price history is reused as-is for 6 hours, then topped up with the missing days
+HISTORY_CACHE_TTL = 6 * 3600
+
+
+def _download_close(symbol: str, start, end) -> pd.Series:
+    """yf.download for one symbol, returning the Close column with a tz-naive index."""
+    if yf is None:
+        raise ImportError("yfinance is not installed")
+    
+    data = yf.download(symbol, start=start, end=end, progress=False)
     
+    if hasattr(data, "columns") and isinstance(data.columns, pd.MultiIndex):
+        close = data["Close"].iloc[:, 0]
+    else:
+        close = data["Close"]
+    
+    if close.index.tz is not None:
+        close.index = close.index.tz_localize(None)
+    return close
+
+
+def fetch_historical_data(symbol: str = "BTC-USD", days: int = 365) -> np.ndarray:
+    """
+    Fetch historical price data using yfinance.
+    Closes are cached per symbol under the local cache directory; a stale cache only
+    downloads the days after its last bar (which is refetched, as it may have been partial).
+    """
     end_date = datetime.now()
     start_date = end_date - timedelta(days=days)
+    start_day = pd.Timestamp(start_date.date())
+    path = cache_path("history", symbol, ext="pkl")
     
-    print(f"Fetching {days} days of {symbol} data...")
-    data = yf.download(symbol, start=start_date, end=end_date, progress=False)
+    cached = None
+    if os.path.exists(path):
+        try:
+            cached = pd.read_pickle(path)
+        except Exception as e:
+            print(f"Ignoring unreadable cache file {path}: {e}")
     
-    if hasattr(data, "columns") and isinstance(data.columns, pd.MultiIndex):
-        prices = data["Close"].iloc[:, 0].tolist()
+    # The cache must reach back far enough; otherwise download the full range
+    if cached is not None and (cached.empty or cached.index[0] > start_day):
+        cached = None
+    
+    if cached is not None and is_fresh(path, HISTORY_CACHE_TTL):
+        close = cached
     else:
-        prices = data["Close"].tolist()
+        fetch_start = start_day if cached is None else cached.index[-1]
+        print(f"Fetching {days} days of {symbol} data...")
+        close = _download_close(symbol, fetch_start, end_date)
+        
+        if cached is not None:
+            close = pd.concat([cached, close])
+            close = close[~close.index.duplicated(keep="last")]
+        
+        if not close.empty:
+            close.to_pickle(path)
+    
+    prices = close[close.index >= pd.Timestamp(start_date)].to_numpy(dtype=np.float64)
     
     print(f"Fetched {len(prices)} data points.")
     return prices
 
 
-def run_comparison(prices: List[float], test_samples: int = 5, 
-                   forecast_days: int = 7) -> Dict[str, Dict]:
-    """Run rolling evaluation on all models."""
-    
+def _fit_one(args: Tuple[str, object, np.ndarray, int]) -> Tuple[str, object, float]:
+    """
+    Fit one model on one training window. Top-level so it can run in a worker process.
+    Returns (name, prediction or exception, elapsed seconds).
+    """
+    name, model, train_data, days = args
+    start_time = time.time()
+    try:
+        pred = model.fit_predict(train_data, days)
+    except Exception as e:
+        pred = e
+    return name, pred, time.time() - start_time
+
+
+def run_comparison(prices: np.ndarray, test_samples: int = 5, 
+                   forecast_days: int = 7, warm_start_xgboost: bool = False) -> Dict[str, Dict]:
+    """
+    Run rolling evaluation on all models.
+    With warm_start_xgboost, each XGBoost fit continues from the previous evaluation
+    point's booster: several times faster, but no longer a cold fit like production.
+    """
+    
+    # One float64 array for the whole run; training windows below are views into it
+    prices = np.asarray(prices, dtype=np.float64)
     evaluator = ModelEvaluator(prices, forecast_days)
     
     # Model instances
@@ -421,25 +544,51 @@ def run_comparison(prices: List[float], test_samples: int = 5,
     print(f"Running {test_samples} rolling evaluations with {forecast_days}-day forecasts")
     print(f"{'='*70}\n")
     
+    # XGBoost runs first, in order, so that each evaluation point can optionally
+    # warm-start from the previous point's booster. It finishes before the pool
+    # starts, so its multi-threaded fits don't compete with the pool for cores
+    # and its timings stay comparable with a standalone run.
+    xgb_model = models["XGBoost"]
+    booster = None
+    xgb_fitted = []
+    for idx in indices:
+        start_time = time.time()
+        pred = xgb_model.fit_predict(prices[:idx], forecast_days, warm_start_booster=booster)
+        xgb_fitted.append(("XGBoost", pred, time.time() - start_time))
+        if warm_start_xgboost and xgb_model.model is not None:
+            booster = xgb_model.model.get_booster()
+    
+    # Every other (evaluation point, model) fit is independent, so they run on a
+    # process pool; results are then consumed in evaluation order. One core is
+    # left for the parent process, and each worker's TF/Prophet/ARIMA fit
+    # already uses threads of its own.
+    # Ensemble runs separately with the other models' predictions.
+    pooled_models = {name: model for name, model in models.items()
+                     if name not in ("XGBoost", "Ensemble")}
+    with ProcessPoolExecutor(max_workers=max(1, (os.cpu_count() or 1) - 1)) as executor:
+        futures = [
+            [executor.submit(_fit_one, (name, model, prices[:idx], forecast_days))
+             for name, model in pooled_models.items()]
+            for idx in indices
+        ]
+        all_fitted = [[future.result() for future in point] + [xgb_fitted[i]]
+                      for i, point in enumerate(futures)]
+    
     for i, idx in enumerate(indices):
         print(f"\n--- Evaluation {i+1}/{test_samples} (using {idx} training points) ---")
         
         train_data = prices[:idx]
-        actual = np.array(prices[idx:idx + forecast_days])
+        actual = prices[idx:idx + forecast_days]
         
         model_preds = {}  # Store for ensemble
         
-        for name, model in models.items():
-            if name == "Ensemble":
-                continue  # Run ensemble separately with other predictions
-                
-            start_time = time.time()
+        for name, pred, elapsed in all_fitted[i]:
+            if isinstance(pred, Exception):
+                print(f"  {name:<20} ERROR: {pred}")
+                continue
             
             try:
-                pred = model.fit_predict(train_data, forecast_days)
                 pred = np.array(pred[:len(actual)])  # Ensure same length
-                
-                elapsed = time.time() - start_time
                 metrics = evaluator.calculate_metrics(actual, pred)
                 
                 results[name]["MAE"].append(metrics["MAE"])
@@ -484,21 +633,29 @@ def run_comparison(prices: List[float], test_samples: int = 5,
 def generate_report(results: Dict[str, Dict], output_path: str = None) -> str:
     """Generate a markdown comparison report."""
     
-    # Calculate averages
-    summary = {}
-    for name, metrics in results.items():
-        if metrics["MAPE"]:
-            summary[name] = {
-                "Avg MAPE": np.mean(metrics["MAPE"]),
-                "Std MAPE": np.std(metrics["MAPE"]),
-                "Avg MAE": np.mean(metrics["MAE"]),
-                "Avg RMSE": np.mean(metrics["RMSE"]),
-                "Avg Time": np.mean(metrics["time"]),
-            }
+    # Calculate averages, one row per model that produced results
+    summary = pd.DataFrame.from_dict({
+        name: {
+            "Avg MAPE": np.mean(metrics["MAPE"]),
+            "Std MAPE": np.std(metrics["MAPE"]),
+            "Avg MAE": np.mean(metrics["MAE"]),
+            "Avg RMSE": np.mean(metrics["RMSE"]),
+            "Avg Time": np.mean(metrics["time"]),
+        }
+        for name, metrics in results.items() if metrics["MAPE"]
+    }, orient="index")
     
     # Sort by MAPE (lower is better)
-    sorted_models = sorted(summary.items(), key=lambda x: x[1]["Avg MAPE"])
-    best_model = sorted_models[0][0]
+    summary = summary.sort_values("Avg MAPE", kind="stable")
+    best_model = summary.index[0]
+    
+    def fmt(col: str, spec: str) -> pd.Series:
+        return summary[col].map(spec.format)
+    
+    names = summary.index.to_series()
+    ranks = pd.Series(range(1, len(summary) + 1), index=summary.index).astype(str)
+    indicators = pd.Series("  ", index=summary.index)
+    indicators.iloc[0] = "🏆"
     
     # Generate report
     report = f"""# Crypto Prediction Model Comparison Report
@@ -511,27 +668,29 @@ def generate_report(results: Dict[str, Dict], output_path: str = None) -> str:
 |------|-------|----------|---------|---------|----------|----------|
 """
     
-    for rank, (name, stats) in enumerate(sorted_models, 1):
-        indicator = "🏆" if rank == 1 else "  "
-        report += f"| {indicator} {rank} | **{name}** | {stats['Avg MAPE']:.2f}% | ±{stats['Std MAPE']:.2f}% | ${stats['Avg MAE']:.2f} | ${stats['Avg RMSE']:.2f} | {stats['Avg Time']:.2f}s |\n"
+    report += "".join(
+        "| " + indicators + " " + ranks + " | **" + names + "** | "
+        + fmt("Avg MAPE", "{:.2f}%") + " | " + fmt("Std MAPE", "±{:.2f}%") + " | "
+        + fmt("Avg MAE", "${:.2f}") + " | " + fmt("Avg RMSE", "${:.2f}") + " | "
+        + fmt("Avg Time", "{:.2f}s") + " |\n"
+    )
     
     report += f"""
 ## Recommendation
 
-Based on MAPE (Mean Absolute Percentage Error), the **{best_model}** model performs best with an average error of {summary[best_model]['Avg MAPE']:.2f}%.
+Based on MAPE (Mean Absolute Percentage Error), the **{best_model}** model performs best with an average error of {summary.at[best_model, 'Avg MAPE']:.2f}%.
 
 ### Model Comparison
 
 """
     
     # Add per-model analysis
-    for name, stats in sorted_models:
-        improvement = ((summary[sorted_models[-1][0]]['Avg MAPE'] - stats['Avg MAPE']) 
-                       / summary[sorted_models[-1][0]]['Avg MAPE'] * 100)
-        report += f"#### {name}\n"
-        report += f"- **MAPE**: {stats['Avg MAPE']:.2f}% (±{stats['Std MAPE']:.2f}%)\n"
-        report += f"- **MAE**: ${stats['Avg MAE']:.2f}\n"
-        report += f"- **Training Time**: {stats['Avg Time']:.2f}s per forecast\n\n"
+    report += "".join(
+        "#### " + names + "\n"
+        + "- **MAPE**: " + fmt("Avg MAPE", "{:.2f}%") + " (" + fmt("Std MAPE", "±{:.2f}%") + ")\n"
+        + "- **MAE**: " + fmt("Avg MAE", "${:.2f}") + "\n"
+        + "- **Training Time**: " + fmt("Avg Time", "{:.2f}s") + " per forecast\n\n"
+    )
     
     report += f"""
 ## Conclusion
@@ -545,9 +704,9 @@ The **{best_model}** model is recommended for integration into CryptoBeacon's pr
 """
     
     # Compare to baseline if we have Prophet results
-    if "Enhanced Prophet" in summary:
-        prophet_mape = summary.get("Enhanced Prophet", {}).get("Avg MAPE", 4.64)
-        best_mape = summary[best_model]["Avg MAPE"]
+    if "Enhanced Prophet" in summary.index:
+        prophet_mape = summary.at["Enhanced Prophet", "Avg MAPE"]
+        best_mape = summary.at[best_model, "Avg MAPE"]
         improvement = (prophet_mape - best_mape) / prophet_mape * 100
         
         report += f"| MAPE | {prophet_mape:.2f}% | {best_mape:.2f}% | {improvement:.1f}% better |\n"
@@ -1,20 +1,38 @@
 import os
-import requests
-import google.generativeai as genai
-from typing import List, Dict
+import time
+import orjson
+from typing import List, Dict, Tuple
+
+from ..http_clients import HTTP_TIMEOUTS, get_http_client
+
+try:
+    import google.generativeai as genai
+except ImportError:
+    genai = None
+
+# NewsData results change slowly, so responses are reused for a minute per query
+NEWS_CACHE_TTL = 60
+
+_news_cache: Dict[str, Tuple[float, List[Dict]]] = {}
 
 def get_api_keys():
     """Get API keys from environment or config."""
     try:
-        from ..config import settings
+        from ..config import get_settings
+        settings = get_settings()
         return settings.NEWSDATA_API_KEY, settings.GEMINI_API_KEY
     except:
         return os.getenv("NEWSDATA_API_KEY"), os.getenv("GEMINI_API_KEY")
 
-def fetch_market_news(query: str = "crypto") -> List[Dict]:
+async def fetch_market_news(query: str = "crypto") -> List[Dict]:
     """
     Fetches news from NewsData.io.
     """
+    now = time.monotonic()
+    cached = _news_cache.get(query)
+    if cached and now - cached[0] < NEWS_CACHE_TTL:
+        return cached[1]
+
     NEWSDATA_API_KEY, _ = get_api_keys()
     
     if not NEWSDATA_API_KEY:
@@ -29,12 +47,19 @@ def fetch_market_news(query: str = "crypto") -> List[Dict]:
     }
     
     try:
-        response = requests.get(url, params=params, timeout=10)
+        response = await get_http_client().get(url, params=params, timeout=HTTP_TIMEOUTS["news"])
         response.raise_for_status()
-        data = response.json()
+        data = orjson.loads(response.content)
         
         if data.get("status") == "success" and "results" in data:
-            return data["results"] or []
+            results = data["results"] or []
+            
+            # Drop expired entries, then remember this response
+            for key in [k for k, (fetched, _) in _news_cache.items() if now - fetched >= NEWS_CACHE_TTL]:
+                del _news_cache[key]
+            _news_cache[query] = (now, results)
+            
+            return results
         else:
             print(f"NewsData API response: {data.get('status', 'unknown')}")
             return []
@@ -43,26 +68,29 @@ def fetch_market_news(query: str = "crypto") -> List[Dict]:
         print(f"Error fetching news: {e}")
         return []
 
-def summarize_articles(articles: List[Dict]) -> str:
-    """
-    Summarizes a list of articles using Google's Gemini API.
-    """
-    _, GEMINI_API_KEY = get_api_keys()
-    
-    if not GEMINI_API_KEY:
-        return "Error: GEMINI_API_KEY not found."
+# Gemini model, configured on first use and reused across requests
+_MODEL = None
 
-    if not articles:
-        return "No articles to summarize."
+def _get_model():
+    """Return the shared Gemini model, or None if no API key is configured."""
+    global _MODEL
+    if _MODEL is None:
+        _, GEMINI_API_KEY = get_api_keys()
+        if not GEMINI_API_KEY:
+            return None
+        genai.configure(api_key=GEMINI_API_KEY)
+        _MODEL = genai.GenerativeModel('gemini-2.5-flash')
+    return _MODEL
 
-    # Prepare the prompt
+def _build_prompt(articles: List[Dict]) -> str:
+    """Builds the briefing prompt from the first five articles."""
     articles_text = ""
     for i, article in enumerate(articles[:5]):
         title = article.get("title", "No Title")
         description = article.get("description") or article.get("content") or "No Description"
         articles_text += f"{i+1}. {title}\nSummary: {description}\n\n"
 
-    prompt = f"""
+    return f"""
     You are a professional financial analyst. Summarize the following market news into a concise briefing.
     Highlight key trends and sentiment. Keep it under 100 words.
     
@@ -72,12 +100,47 @@ def summarize_articles(articles: List[Dict]) -> str:
     Summary:
     """
 
+def summarize_articles(articles: List[Dict]) -> str:
+    """
+    Summarizes a list of articles using Google's Gemini API.
+    """
+    if genai is None:
+        return "Error: google-generativeai is not installed."
+
+    model = _get_model()
+    
+    if model is None:
+        return "Error: GEMINI_API_KEY not found."
+
+    if not articles:
+        return "No articles to summarize."
+
     try:
-        genai.configure(api_key=GEMINI_API_KEY)
-        model = genai.GenerativeModel('gemini-2.5-flash')
-        response = model.generate_content(prompt)
+        response = model.generate_content(_build_prompt(articles))
         return response.text
     except Exception as e:
         print(f"Error generating summary: {e}")
         return f"Failed to generate summary: {str(e)}"
 
+async def summarize_articles_async(articles: List[Dict]) -> str:
+    """
+    Async variant of summarize_articles for request handlers; the Gemini call
+    does not block the event loop.
+    """
+    if genai is None:
+        return "Error: google-generativeai is not installed."
+
+    model = _get_model()
+    
+    if model is None:
+        return "Error: GEMINI_API_KEY not found."
+
+    if not articles:
+        return "No articles to summarize."
+
+    try:
+        response = await model.generate_content_async(_build_prompt(articles))
+        return response.text
+    except Exception as e:
+        print(f"Error generating summary: {e}")
+        return f"Failed to generate summary: {str(e)}"
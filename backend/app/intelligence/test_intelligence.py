@@ -1,3 +1,4 @@
+import asyncio
 import sys
 import os
 from dotenv import load_dotenv
@@ -54,7 +55,7 @@ def test_news_agent():
 
         # Test Fetch
         print("Fetching news (Simulated if keys missing/invalid)...")
-        news = fetch_market_news(query="crypto")
+        news = asyncio.run(fetch_market_news(query="crypto"))
         print(f"Fetched {len(news)} articles.")
         
         if not news:
@@ -78,7 +79,7 @@ def test_news_agent():
 
     except ImportError as e:
         print(f"ImportError: {e}")
-        print("Make sure 'requests' and 'google-generativeai' are installed.")
+        print("Make sure 'httpx' and 'google-generativeai' are installed.")
     except Exception as e:
         print(f"Error during news agent test: {e}")
 
@@ -0,0 +1,34 @@
+import logging
+import queue
+from logging.handlers import QueueHandler, QueueListener
+from typing import Optional
+
+# Records from the app's loggers are queued and written to stderr by a
+# background thread, so logging never blocks the event loop on I/O
+_listener: Optional[QueueListener] = None
+
+
+def start_logging(level: int = logging.INFO):
+    global _listener
+    if _listener is not None:
+        return
+
+    stream = logging.StreamHandler()
+    stream.setFormatter(logging.Formatter("%(asctime)s %(levelname)s %(name)s: %(message)s"))
+
+    log_queue: "queue.SimpleQueue[logging.LogRecord]" = queue.SimpleQueue()
+    logger = logging.getLogger("app")
+    logger.setLevel(level)
+    logger.addHandler(QueueHandler(log_queue))
+    logger.propagate = False
+
+    _listener = QueueListener(log_queue, stream, respect_handler_level=True)
+    _listener.start()
+
+
+def stop_logging():
+    # Flushes whatever is still queued before the process exits
+    global _listener
+    if _listener is not None:
+        _listener.stop()
+        _listener = None
@@ -1,9 +1,35 @@
+import asyncio
+from contextlib import asynccontextmanager
+
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from .routers import auth, portfolio, watchlist, intelligence, market, crypto
 from .database import db
+from .http_clients import get_http_client, close_http_client
+from .services.auth_service import close_smtp_session
+from .logging_config import start_logging, stop_logging
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    start_logging()
+    db.connect_db()
+    app.state.http_client = get_http_client()
+    app.state.ensure_indexes = asyncio.create_task(db.ensure_indexes())
+    from .services.scheduler import start_scheduler
+    start_scheduler()
+    # Load forecasting libraries and kernels in the background so the first
+    # forecast request doesn't pay for them
+    from .intelligence.forecast import warm_up
+    app.state.forecast_warm_up = asyncio.get_running_loop().run_in_executor(None, warm_up)
+    
+    yield
+    
+    db.close_db()
+    await close_http_client()
+    await close_smtp_session()
+    stop_logging()
 
-app = FastAPI(title="CryptoBeacon API")
+app = FastAPI(title="CryptoBeacon API", lifespan=lifespan)
 
 # CORS
 origins = [
@@ -20,16 +46,6 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
-@app.on_event("startup")
-async def startup_db_client():
-    db.connect_db()
-    from .services.scheduler import start_scheduler
-    start_scheduler()
-
-@app.on_event("shutdown")
-async def shutdown_db_client():
-    db.close_db()
-
 app.include_router(auth.router, prefix="/auth")
 app.include_router(portfolio.router)
 app.include_router(watchlist.router)
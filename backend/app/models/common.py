@@ -0,0 +1,13 @@
+from typing import Annotated, Any, Optional
+
+from bson import ObjectId
+from pydantic import BeforeValidator, ConfigDict
+
+def _oid_to_str(v: Any) -> Any:
+    return str(v) if isinstance(v, ObjectId) else v
+
+# Mongo `_id` exposed as a string; ObjectIds are converted before the native str validation
+ObjectIdStr = Annotated[Optional[str], BeforeValidator(_oid_to_str)]
+
+# Shared config for models populated from Mongo documents
+MONGO_MODEL_CONFIG = ConfigDict(populate_by_name=True, arbitrary_types_allowed=True)
@@ -1,7 +1,7 @@
-from pydantic import BaseModel, Field, field_validator
-from typing import Optional, Any
+from pydantic import BaseModel, Field
+from typing import Optional
 from datetime import datetime
-from bson import ObjectId
+from .common import ObjectIdStr, MONGO_MODEL_CONFIG
 
 class PortfolioItemBase(BaseModel):
     coin_symbol: str
@@ -12,28 +12,15 @@ class PortfolioItemCreate(PortfolioItemBase):
     pass
 
 class PortfolioItemInDB(PortfolioItemBase):
-    id: Optional[str] = Field(alias="_id", default=None)
+    model_config = MONGO_MODEL_CONFIG
+
+    id: ObjectIdStr = Field(alias="_id", default=None)
     user_id: str
     date_added: datetime = Field(default_factory=datetime.utcnow)
 
-    class Config:
-        populate_by_name = True
-        arbitrary_types_allowed = True
-        json_encoders = {ObjectId: str}
-
 class PortfolioItemResponse(PortfolioItemBase):
-    id: Optional[str] = Field(alias="_id", default=None)
-    date_added: Optional[datetime] = None  # Made optional for backward compatibility
+    model_config = MONGO_MODEL_CONFIG
 
-    @field_validator('id', mode='before')
-    @classmethod
-    def convert_objectid(cls, v: Any) -> Optional[str]:
-        if isinstance(v, ObjectId):
-            return str(v)
-        return v
-
-    class Config:
-        populate_by_name = True
-        arbitrary_types_allowed = True
-        json_encoders = {ObjectId: str}
+    id: ObjectIdStr = Field(alias="_id", default=None)
+    date_added: Optional[datetime] = None  # Made optional for backward compatibility
 
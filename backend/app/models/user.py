@@ -1,22 +1,7 @@
 from pydantic import BaseModel, EmailStr, Field
 from typing import Optional, List
 from datetime import datetime
-from bson import ObjectId
-
-class PyObjectId(ObjectId):
-    @classmethod
-    def __get_validators__(cls):
-        yield cls.validate
-
-    @classmethod
-    def validate(cls, v, values):
-        if not ObjectId.is_valid(v):
-            raise ValueError("Invalid objectid")
-        return ObjectId(v)
-
-    @classmethod
-    def __get_pydantic_json_schema__(cls, core_schema, handler):
-        return {"type": "string"}
+from .common import ObjectIdStr, MONGO_MODEL_CONFIG
 
 class UserBase(BaseModel):
     email: EmailStr
@@ -33,32 +18,27 @@ class UserDelete(BaseModel):
     password: str
 
 class UserInDB(UserBase):
-    id: Optional[str] = Field(alias="_id", default=None)
+    model_config = MONGO_MODEL_CONFIG
+
+    id: ObjectIdStr = Field(alias="_id", default=None)
     password_hash: str
     is_verified: bool = False
     watchlist: List[str] = []
     created_at: datetime = Field(default_factory=datetime.utcnow)
 
-    class Config:
-        populate_by_name = True
-        arbitrary_types_allowed = True
-        json_encoders = {ObjectId: str}
-
 class UserResponse(UserBase):
-    id: Optional[str] = Field(alias="_id", default=None)
+    model_config = MONGO_MODEL_CONFIG
+
+    id: ObjectIdStr = Field(alias="_id", default=None)
     is_verified: bool
     watchlist: List[str]
 
-    class Config:
-        populate_by_name = True
-        arbitrary_types_allowed = True
-        json_encoders = {ObjectId: str}
-
 class Token(BaseModel):
     access_token: str
     token_type: str
 
 class TokenData(BaseModel):
+    user_id: Optional[str] = None
     username: Optional[str] = None
 
 class OTPVerify(BaseModel):
@@ -1,17 +1,46 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+import asyncio
+import hashlib
+import time
+from cachetools import TTLCache
+from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordBearer, OAuth2PasswordRequestForm
 from jose import JWTError, jwt
 from motor.motor_asyncio import AsyncIOMotorDatabase
+from pymongo.errors import DuplicateKeyError
+from bson import ObjectId
 from pydantic import BaseModel, EmailStr
 from ..database import get_database
 from ..models.user import UserCreate, UserResponse, UserInDB, Token, OTPVerify, TokenData, UserDelete
-from ..services.auth_service import get_password_hash, verify_password, create_access_token, generate_otp, send_otp_email, send_goodbye_email
-from ..config import settings
+from ..services.auth_service import get_password_hash_async, verify_password_async, create_access_token, generate_otp, hash_otp, otp_matches, send_otp_email, send_goodbye_email
+from ..config import get_settings
 from datetime import timedelta, datetime
 
+settings = get_settings()
+
 router = APIRouter()
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="token")
 
+# Users resolved from bearer tokens, keyed by a hash of the token so clients reusing
+# a token skip the JWT decode and the user lookup. Entries live for USER_CACHE_TTL
+# seconds and never past the token's own expiry; failed validations are not cached.
+USER_CACHE_TTL = 60
+_user_cache: TTLCache = TTLCache(maxsize=10000, ttl=USER_CACHE_TTL)
+
+# Fields read into UserInDB (watchlist routes read the cached user's watchlist)
+_USER_PROJECTION = {
+    "email": 1, "username": 1, "password_hash": 1,
+    "is_verified": 1, "watchlist": 1, "created_at": 1,
+}
+
+def _token_key(token: str) -> str:
+    return hashlib.sha256(token.encode()).hexdigest()[:32]
+
+def invalidate_cached_user(email: str) -> None:
+    """Drop every cached token entry for the given user after their document changes."""
+    for key, (_, user) in list(_user_cache.items()):
+        if user.email == email:
+            _user_cache.pop(key, None)
+
 # Request model for resending OTP
 class ResendOTPRequest(BaseModel):
     email: EmailStr
@@ -31,20 +60,43 @@ async def get_current_user(token: str = Depends(oauth2_scheme), db: AsyncIOMotor
         detail="Could not validate credentials",
         headers={"WWW-Authenticate": "Bearer"},
     )
+    key = _token_key(token)
+    cached = _user_cache.get(key)
+    if cached is not None:
+        expires_at, user = cached
+        if time.time() < expires_at:
+            return user
+        _user_cache.pop(key, None)
+    
     try:
         payload = jwt.decode(token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM])
-        username: str = payload.get("sub")
-        if username is None:
+        subject: str = payload.get("sub")
+        if subject is None:
             raise credentials_exception
-        token_data = TokenData(username=username)
+        # Tokens carry the user's _id as subject and the username as "u";
+        # tokens issued before that carry only the username as subject
+        if "u" in payload:
+            token_data = TokenData(user_id=subject, username=payload["u"])
+        else:
+            token_data = TokenData(username=subject)
     except JWTError:
         raise credentials_exception
     
-    user = await db.users.find_one({"username": token_data.username})
+    if token_data.user_id is not None:
+        if not ObjectId.is_valid(token_data.user_id):
+            raise credentials_exception
+        query = {"_id": ObjectId(token_data.user_id)}
+    else:
+        query = {"username": token_data.username}
+    user = await db.users.find_one(query, _USER_PROJECTION)
     if user is None:
         raise credentials_exception
     user["_id"] = str(user["_id"])
-    return UserInDB(**user)
+    user = UserInDB(**user)
+    
+    expires_at = min(time.time() + USER_CACHE_TTL, payload.get("exp", float("inf")))
+    _user_cache[key] = (expires_at, user)
+    return user
 
 @router.post("/register")
 async def register(user: UserCreate, db: AsyncIOMotorDatabase = Depends(get_database)):
@@ -52,34 +104,29 @@ async def register(user: UserCreate, db: AsyncIOMotorDatabase = Depends(get_data
     Step 1 of registration: Store user in pending_registrations and send OTP.
     User is NOT created in the main users collection until OTP is verified.
     """
-    # Check if email already exists in verified users
-    existing_user = await db.users.find_one({"email": user.email})
+    # Check if email or username already exist in verified users (both lookups in flight at once)
+    existing_user, existing_username = await asyncio.gather(
+        db.users.find_one({"email": user.email}, {"_id": 1}),
+        db.users.find_one({"username": user.username}, {"_id": 1}),
+    )
     if existing_user:
         raise HTTPException(status_code=400, detail="Email already registered")
-
-    # Check if username already exists in verified users
-    existing_username = await db.users.find_one({"username": user.username})
     if existing_username:
         raise HTTPException(status_code=400, detail="Username already taken")
 
-    # Check if there's already a pending registration for this email
-    existing_pending = await db.pending_registrations.find_one({"email": user.email})
-    if existing_pending:
-        # Delete the old pending registration to allow re-registration
-        await db.pending_registrations.delete_one({"_id": existing_pending["_id"]})
-
     # Generate OTP
     otp = generate_otp()
 
-    # Store in pending_registrations (not users)
+    # Store in pending_registrations (not users), replacing any earlier
+    # pending registration for this email to allow re-registration
     pending_data = {
         "email": user.email,
         "username": user.username,
-        "password_hash": get_password_hash(user.password),
-        "otp_code": otp,
+        "password_hash": await get_password_hash_async(user.password),
+        "otp_code": hash_otp(otp),
         "created_at": datetime.utcnow()
     }
-    await db.pending_registrations.insert_one(pending_data)
+    await db.pending_registrations.replace_one({"email": user.email}, pending_data, upsert=True)
 
     # Send OTP email
     await send_otp_email(user.email, otp)
@@ -97,13 +144,14 @@ async def verify_registration(otp_data: OTPVerify, db: AsyncIOMotorDatabase = De
         raise HTTPException(status_code=400, detail="No pending registration found for this email")
 
     # Check if OTP matches
-    if pending["otp_code"] != otp_data.otp_code:
+    if not otp_matches(pending["otp_code"], otp_data.otp_code):
         raise HTTPException(status_code=400, detail="Invalid OTP code")
 
-    # Check if OTP is expired (10 minutes)
-    otp_age = datetime.utcnow() - pending["created_at"]
+    # Check if OTP is expired (10 minutes). The TTL index removes the document
+    # itself, but only on Mongo's next sweep, so the age is still checked here
+    now = datetime.utcnow()
+    otp_age = now - pending["created_at"]
     if otp_age.total_seconds() > 600:  # 10 minutes
-        await db.pending_registrations.delete_one({"_id": pending["_id"]})
         raise HTTPException(status_code=400, detail="OTP has expired. Please register again.")
 
     # Create the actual user in the users collection
@@ -112,11 +160,16 @@ async def verify_registration(otp_data: OTPVerify, db: AsyncIOMotorDatabase = De
         "username": pending["username"],
         "password_hash": pending["password_hash"],
         "is_verified": True,
-        "created_at": datetime.utcnow(),
+        "created_at": now,
         "watchlist": []
     }
 
-    new_user = await db.users.insert_one(user_dict)
+    # The unique indexes reject an email/username claimed since registration started
+    try:
+        await db.users.insert_one(user_dict)
+    except DuplicateKeyError as e:
+        field = "Email" if "email" in (e.details or {}).get("keyPattern", {}) else "Username"
+        raise HTTPException(status_code=400, detail=f"{field} already registered")
     
     # Delete the pending registration
     await db.pending_registrations.delete_one({"_id": pending["_id"]})
@@ -129,7 +182,7 @@ async def resend_otp(request: ResendOTPRequest, db: AsyncIOMotorDatabase = Depen
     Resend OTP for a pending registration.
     """
     # Find the pending registration
-    pending = await db.pending_registrations.find_one({"email": request.email})
+    pending = await db.pending_registrations.find_one({"email": request.email}, {"_id": 1})
     if not pending:
         raise HTTPException(status_code=400, detail="No pending registration found for this email")
 
@@ -139,7 +192,7 @@ async def resend_otp(request: ResendOTPRequest, db: AsyncIOMotorDatabase = Depen
     # Update the pending registration with new OTP and reset timestamp
     await db.pending_registrations.update_one(
         {"_id": pending["_id"]},
-        {"$set": {"otp_code": new_otp, "created_at": datetime.utcnow()}}
+        {"$set": {"otp_code": hash_otp(new_otp), "created_at": datetime.utcnow()}}
     )
 
     # Send new OTP email
@@ -159,7 +212,7 @@ async def forgot_password(request: ForgotPasswordRequest, db: AsyncIOMotorDataba
     """
     Initiate password reset: Check if user exists, generate OTP, and send email.
     """
-    user = await db.users.find_one({"email": request.email})
+    user = await db.users.find_one({"email": request.email}, {"_id": 1})
     if not user:
         # For security, we might want to return 200 even if user doesn't exist,
         # but for this project's user-friendliness, we'll return 404/400.
@@ -169,10 +222,9 @@ async def forgot_password(request: ForgotPasswordRequest, db: AsyncIOMotorDataba
     otp = generate_otp()
 
     # Store/Update in password_resets collection
-    # Upsert to handle multiple requests
+    # Upsert to handle multiple requests; email is taken from the filter on insert
     reset_data = {
-        "email": request.email,
-        "otp_code": otp,
+        "otp_code": hash_otp(otp),
         "created_at": datetime.utcnow()
     }
     
@@ -193,22 +245,23 @@ async def reset_password(request: ResetPasswordRequest, db: AsyncIOMotorDatabase
     Verify OTP and update password.
     """
     # Check for reset request
-    reset_request = await db.password_resets.find_one({"email": request.email})
+    reset_request = await db.password_resets.find_one(
+        {"email": request.email}, {"otp_code": 1, "created_at": 1}
+    )
     if not reset_request:
         raise HTTPException(status_code=400, detail="No password reset request found for this email")
 
     # Check OTP
-    if reset_request["otp_code"] != request.otp_code:
+    if not otp_matches(reset_request["otp_code"], request.otp_code):
         raise HTTPException(status_code=400, detail="Invalid code")
 
-    # Check Expiry (e.g., 15 mins)
+    # Check Expiry (e.g., 15 mins); expired documents are pruned by the TTL index
     otp_age = datetime.utcnow() - reset_request["created_at"]
     if otp_age.total_seconds() > 900:
-        await db.password_resets.delete_one({"_id": reset_request["_id"]})
         raise HTTPException(status_code=400, detail="Code expired. Please request a new one.")
 
     # Update Password
-    new_hash = get_password_hash(request.new_password)
+    new_hash = await get_password_hash_async(request.new_password)
     await db.users.update_one(
         {"email": request.email},
         {"$set": {"password_hash": new_hash}}
@@ -216,19 +269,20 @@ async def reset_password(request: ResetPasswordRequest, db: AsyncIOMotorDatabase
 
     # Clean up reset request
     await db.password_resets.delete_one({"_id": reset_request["_id"]})
+    invalidate_cached_user(request.email)
 
     return {"message": "Password updated successfully. You can now login."}
 
 
 @router.post("/token", response_model=Token)
 async def login_for_access_token(form_data: OAuth2PasswordRequestForm = Depends(), db: AsyncIOMotorDatabase = Depends(get_database)):
-    # Try to find user by username first, then by email
-    user = await db.users.find_one({"username": form_data.username})
-    if not user:
-        # If not found by username, try email
-        user = await db.users.find_one({"email": form_data.username})
+    # The identifier may be a username or an email; match either in one query
+    user = await db.users.find_one(
+        {"$or": [{"username": form_data.username}, {"email": form_data.username}]},
+        {"username": 1, "password_hash": 1, "is_verified": 1}
+    )
     
-    if not user or not verify_password(form_data.password, user["password_hash"]):
+    if not user or not await verify_password_async(form_data.password, user["password_hash"]):
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Incorrect username or password",
@@ -240,33 +294,34 @@ async def login_for_access_token(form_data: OAuth2PasswordRequestForm = Depends(
 
     access_token_expires = timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES)
     access_token = create_access_token(
-        data={"sub": user["username"]}, expires_delta=access_token_expires
+        data={"sub": str(user["_id"]), "u": user["username"]}, expires_delta=access_token_expires
     )
     return {"access_token": access_token, "token_type": "bearer"}
 
 @router.delete("/delete-account")
-async def delete_account(user_delete: UserDelete, current_user: UserInDB = Depends(get_current_user), db: AsyncIOMotorDatabase = Depends(get_database)):
+async def delete_account(user_delete: UserDelete, background_tasks: BackgroundTasks, current_user: UserInDB = Depends(get_current_user), db: AsyncIOMotorDatabase = Depends(get_database)):
     # Verify password
-    if not verify_password(user_delete.password, current_user.password_hash):
+    if not await verify_password_async(user_delete.password, current_user.password_hash):
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Incorrect password"
         )
     
-    from bson import ObjectId
     user_id = ObjectId(current_user.id)
     
-    # Send Goodbye Email
-    await send_goodbye_email(current_user.email, current_user.username)
-
-    # 1. Delete associated portfolio items
+    # Delete associated portfolio items and the user document (includes watchlist
+    # and profile) concurrently
     # Note: portfolio stores user_id as string
-    await db.portfolio.delete_many({"user_id": str(current_user.id)})
-    
-    # 2. Delete user document (includes watchlist and profile)
-    result = await db.users.delete_one({"_id": user_id})
+    _, result = await asyncio.gather(
+        db.portfolio.delete_many({"user_id": str(current_user.id)}),
+        db.users.delete_one({"_id": user_id}),
+    )
+    invalidate_cached_user(current_user.email)
     
     if result.deleted_count == 0:
         raise HTTPException(status_code=500, detail="Failed to delete account")
+    
+    # Send Goodbye Email after the response so SMTP isn't on the request path
+    background_tasks.add_task(send_goodbye_email, current_user.email, current_user.username)
         
     return {"message": "Account deleted successfully"}
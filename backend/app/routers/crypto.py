@@ -1,12 +1,21 @@
 from fastapi import APIRouter, HTTPException, Depends
+from fastapi.concurrency import run_in_threadpool
 from motor.motor_asyncio import AsyncIOMotorDatabase
+import asyncio
 import httpx
-from typing import Optional
-from datetime import datetime
+import json
+import orjson
+from cachetools import TTLCache
+from typing import Dict, List, Optional
+from datetime import datetime, timedelta
 from ..database import get_database
-from ..config import settings
+from ..http_clients import HTTP_TIMEOUTS, get_http_client
+from ..services.locks import fill_lock
+from ..config import get_settings
 from ..routers.auth import get_current_user
 
+settings = get_settings()
+
 router = APIRouter()
 
 # Crypto name mapping for common cryptocurrencies
@@ -38,6 +47,23 @@ CRYPTO_NAMES = {
     "FIL": "Filecoin",
 }
 
+# Fallback for /symbols when Binance is unreachable, built once
+_BASIC_SYMBOLS = tuple(
+    {"symbol": k, "name": v, "icon": f"https://ui-avatars.com/api/?name={k}&background=1a1a1a&color=10b981"}
+    for k, v in CRYPTO_NAMES.items()
+)
+
+
+# Process-local caches in front of Mongo and Binance: the symbol list for an hour
+# and per-symbol details for 10 seconds
+_symbols_mem: TTLCache = TTLCache(maxsize=1, ttl=3600)
+_ticker_mem: TTLCache = TTLCache(maxsize=1024, ttl=10)
+
+# Forecasts are also kept in the forecast_cache collection for FORECAST_CACHE_TTL
+# seconds; the in-process copy is a shorter-lived first tier
+FORECAST_CACHE_TTL = 3600
+_forecast_mem: TTLCache = TTLCache(maxsize=512, ttl=600)
+
 
 @router.get("/symbols")
 async def get_crypto_symbols(db: AsyncIOMotorDatabase = Depends(get_database)):
@@ -46,6 +72,19 @@ async def get_crypto_symbols(db: AsyncIOMotorDatabase = Depends(get_database)):
     Public endpoint - no authentication required for search functionality.
     Cached for 24 hours to reduce API calls.
     """
+    symbols = _symbols_mem.get("all")
+    if symbols is not None:
+        return {"symbols": symbols}
+    
+    async with fill_lock("symbols"):
+        symbols = _symbols_mem.get("all")
+        if symbols is not None:
+            return {"symbols": symbols}
+        return await _load_symbols(db)
+
+
+async def _load_symbols(db: AsyncIOMotorDatabase) -> dict:
+    """Symbols from the Mongo cache or Binance; successful results are kept in _symbols_mem."""
     # Check cache first
     cached = await db.symbols_cache.find_one({"_id": "binance_symbols"})
     
@@ -53,61 +92,60 @@ async def get_crypto_symbols(db: AsyncIOMotorDatabase = Depends(get_database)):
         # Check if cache is still valid (24 hours)
         age_seconds = (datetime.utcnow() - cached.get("fetched_at", datetime.min)).total_seconds()
         if age_seconds < 86400:  # 24 hours
-            return {"symbols": cached.get("symbols", [])}
+            symbols = cached.get("symbols", [])
+            _symbols_mem["all"] = symbols
+            return {"symbols": symbols}
     
     # Fetch fresh data from Binance
     try:
-        async with httpx.AsyncClient() as client:
-            response = await client.get(
-                "https://api.binance.com/api/v3/exchangeInfo",
-                timeout=15.0
-            )
-            response.raise_for_status()
-            data = response.json()
-            
-            # Filter USDT pairs and extract symbols
-            symbols = []
-            seen = set()
-            
-            for s in data.get("symbols", []):
-                if s.get("quoteAsset") == "USDT" and s.get("status") == "TRADING":
-                    base = s.get("baseAsset")
-                    if base and base not in seen:
-                        seen.add(base)
-                        name = CRYPTO_NAMES.get(base, base)
-                        # Use CoinCap CDN for icons (more reliable)
-                        icon = f"https://assets.coincap.io/assets/icons/{base.lower()}@2x.png"
-                        
-                        symbols.append({
-                            "symbol": base,
-                            "name": name,
-                            "icon": icon
-                        })
-            
-            # Sort alphabetically by name
-            symbols.sort(key=lambda x: x["name"])
-            
-            # Cache in MongoDB
-            await db.symbols_cache.update_one(
-                {"_id": "binance_symbols"},
-                {
-                    "$set": {
-                        "symbols": symbols,
-                        "fetched_at": datetime.utcnow()
-                    }
-                },
-                upsert=True
-            )
-            
-            return {"symbols": symbols}
-            
+        client = get_http_client()
+        response = await client.get(
+            "https://api.binance.com/api/v3/exchangeInfo",
+            timeout=HTTP_TIMEOUTS["exchangeInfo"]
+        )
+        response.raise_for_status()
+        data = orjson.loads(response.content)
+        
+        # Filter USDT pairs and extract symbols
+        symbols = []
+        seen = set()
+        
+        for s in data.get("symbols", []):
+            if s.get("quoteAsset") == "USDT" and s.get("status") == "TRADING":
+                base = s.get("baseAsset")
+                if base and base not in seen:
+                    seen.add(base)
+                    name = CRYPTO_NAMES.get(base, base)
+                    # Use CoinCap CDN for icons (more reliable)
+                    icon = f"https://assets.coincap.io/assets/icons/{base.lower()}@2x.png"
+                    
+                    symbols.append({
+                        "symbol": base,
+                        "name": name,
+                        "icon": icon
+                    })
+        
+        # Sort alphabetically by name
+        symbols.sort(key=lambda x: x["name"])
+        
+        # Cache in MongoDB
+        await db.symbols_cache.update_one(
+            {"_id": "binance_symbols"},
+            {
+                "$set": {
+                    "symbols": symbols,
+                    "fetched_at": datetime.utcnow()
+                }
+            },
+            upsert=True
+        )
+        
+        _symbols_mem["all"] = symbols
+        return {"symbols": symbols}
+        
     except Exception as e:
         # Return basic list if Binance API fails
-        basic_symbols = [
-            {"symbol": k, "name": v, "icon": f"https://ui-avatars.com/api/?name={k}&background=1a1a1a&color=10b981"}
-            for k, v in CRYPTO_NAMES.items()
-        ]
-        return {"symbols": basic_symbols, "error": str(e)}
+        return {"symbols": list(_BASIC_SYMBOLS), "error": str(e)}
 
 
 @router.delete("/symbols/refresh")
@@ -115,9 +153,187 @@ async def refresh_symbols_cache(db: AsyncIOMotorDatabase = Depends(get_database)
     """
     Clear the symbols cache to force a refresh on next request.
     """
+    _symbols_mem.clear()
     result = await db.symbols_cache.delete_one({"_id": "binance_symbols"})
     return {"message": "Cache cleared", "deleted": result.deleted_count > 0}
 
+
+# Icon map for well-known coins
+ICON_MAP = {
+    "BTC": "https://assets.coingecko.com/coins/images/1/small/bitcoin.png",
+    "ETH": "https://assets.coingecko.com/coins/images/279/small/ethereum.png",
+    "USDT": "https://assets.coingecko.com/coins/images/325/small/Tether.png",
+    "BNB": "https://assets.coingecko.com/coins/images/825/small/bnb-icon2_2x.png",
+    "SOL": "https://assets.coingecko.com/coins/images/4128/small/solana.png",
+    "XRP": "https://assets.coingecko.com/coins/images/44/small/xrp-symbol-white-128.png",
+    "USDC": "https://assets.coingecko.com/coins/images/6319/small/usdc.png",
+    "ADA": "https://assets.coingecko.com/coins/images/975/small/cardano.png",
+    "AVAX": "https://assets.coingecko.com/coins/images/12559/small/Avalanche_Circle_RedWhite_Trans.png",
+    "DOGE": "https://assets.coingecko.com/coins/images/5/small/dogecoin.png",
+    "DOT": "https://assets.coingecko.com/coins/images/12171/small/polkadot.png",
+    "MATIC": "https://assets.coingecko.com/coins/images/4713/small/polygon.png",
+    "SHIB": "https://assets.coingecko.com/coins/images/11939/small/shiba.png",
+    "LTC": "https://assets.coingecko.com/coins/images/2/small/litecoin.png",
+    "LINK": "https://assets.coingecko.com/coins/images/877/small/chainlink-new-logo.png",
+}
+
+# Stablecoins have no XXXUSDT pair and are reported at a fixed $1
+STABLECOINS = frozenset({"USDT", "USDC", "DAI", "BUSD", "TUSD"})
+
+# Most symbols accepted by /batch, and concurrent Binance calls it may make
+BATCH_MAX_SYMBOLS = 50
+BATCH_CONCURRENCY = 20
+
+
+def _icon_for(symbol: str) -> str:
+    return ICON_MAP.get(symbol, f"https://ui-avatars.com/api/?name={symbol}&background=1a1a1a&color=10b981&bold=true")
+
+
+def _stablecoin_details(symbol: str) -> dict:
+    return {
+        "symbol": symbol,
+        "name": CRYPTO_NAMES.get(symbol, symbol),
+        "icon": _icon_for(symbol),
+        "price": 1.00,
+        "priceChange": 0.00,
+        "priceChangePercent": 0.00,
+        "high24h": 1.001,
+        "low24h": 0.999,
+        "open24h": 1.00,
+        "volume": 0,
+        "quoteVolume": 0,
+        "bidPrice": 1.00,
+        "askPrice": 1.00,
+        "tradeCount": 0,
+        "weightedAvgPrice": 1.00,
+        "isStablecoin": True
+    }
+
+
+# Stablecoin responses never change, so they are built once and shared
+_STABLE_DETAILS = {symbol: _stablecoin_details(symbol) for symbol in STABLECOINS}
+_STABLE_FORECASTS = {
+    symbol: {
+        "symbol": symbol,
+        "currentPrice": 1.00,
+        "predictedPrice": 1.00,
+        "changePercent": 0.0,
+        "forecast": [1.00, 1.00, 1.00, 1.00, 1.00, 1.00, 1.00],
+        "labels": ["Mon", "Tue", "Wed", "Thu", "Fri", "Sat", "Sun"],
+        "historicalPrices": [1.00, 1.00, 1.00, 1.00, 1.00, 1.00, 1.00],
+        "isStablecoin": True
+    }
+    for symbol in STABLECOINS
+}
+
+
+# Response fields taken from a Binance 24hr ticker: (response key, ticker key, cast)
+_TICKER_FIELDS = (
+    # Price Data
+    ("price", "lastPrice", float),
+    ("priceChange", "priceChange", float),
+    ("priceChangePercent", "priceChangePercent", float),
+    # 24h Range
+    ("high24h", "highPrice", float),
+    ("low24h", "lowPrice", float),
+    ("open24h", "openPrice", float),
+    # Volume
+    ("volume", "volume", float),
+    ("quoteVolume", "quoteVolume", float),
+    # Order Book
+    ("bidPrice", "bidPrice", float),
+    ("askPrice", "askPrice", float),
+    # Trade Stats
+    ("tradeCount", "count", int),
+    # Weighted Average
+    ("weightedAvgPrice", "weightedAvgPrice", float),
+)
+
+
+def _details_from_ticker(symbol: str, data: dict) -> dict:
+    """Map a Binance 24hr ticker entry to the details response."""
+    details = {
+        "symbol": symbol,
+        "name": CRYPTO_NAMES.get(symbol, symbol),
+        "icon": _icon_for(symbol),
+    }
+    details.update({key: cast(data[src]) for key, src, cast in _TICKER_FIELDS})
+    return details
+
+
+async def _fetch_tickers(symbols: List[str]) -> Dict[str, dict]:
+    """
+    24hr tickers for several base symbols, keyed by symbol. Binance answers a
+    multi-symbol request in one call, but rejects the whole request if any pair is
+    unknown; in that case each pair is fetched on its own (concurrently) and
+    unknown ones are left out.
+    """
+    client = get_http_client()
+    pairs = [f"{symbol}USDT" for symbol in symbols]
+    response = await client.get(
+        "https://api.binance.com/api/v3/ticker/24hr",
+        params={"symbols": json.dumps(pairs, separators=(",", ":"))},
+        timeout=HTTP_TIMEOUTS["ticker/24hr"],
+    )
+    if response.status_code != 400:
+        response.raise_for_status()
+        return {entry["symbol"][:-4]: entry for entry in orjson.loads(response.content)}
+    
+    semaphore = asyncio.Semaphore(BATCH_CONCURRENCY)
+    
+    async def fetch_one(pair: str):
+        async with semaphore:
+            return await client.get(
+                "https://api.binance.com/api/v3/ticker/24hr",
+                params={"symbol": pair},
+                timeout=HTTP_TIMEOUTS["ticker/24hr"],
+            )
+    
+    responses = await asyncio.gather(*(fetch_one(pair) for pair in pairs))
+    tickers = {}
+    for symbol, r in zip(symbols, responses):
+        if r.status_code == 400:
+            continue
+        r.raise_for_status()
+        tickers[symbol] = orjson.loads(r.content)
+    return tickers
+
+
+@router.get("/batch")
+async def get_crypto_details_batch(symbols: str, current_user = Depends(get_current_user)):
+    """
+    Get details for several cryptocurrencies at once, e.g. /batch?symbols=BTC,ETH,SOL.
+    Returns the same fields as /{symbol} for each symbol found; unknown symbols are
+    listed under "notFound".
+    """
+    requested = list(dict.fromkeys(s.strip().upper() for s in symbols.split(",") if s.strip()))
+    if not requested:
+        raise HTTPException(status_code=400, detail="No symbols given")
+    if len(requested) > BATCH_MAX_SYMBOLS:
+        raise HTTPException(status_code=400, detail=f"At most {BATCH_MAX_SYMBOLS} symbols per request")
+    
+    traded = [s for s in requested if s not in STABLECOINS]
+    
+    try:
+        tickers = await _fetch_tickers(traded) if traded else {}
+    except httpx.TimeoutException:
+        raise HTTPException(status_code=504, detail="Binance API timeout")
+    except httpx.HTTPError as e:
+        raise HTTPException(status_code=502, detail=f"Binance API error: {str(e)}")
+    
+    results = []
+    not_found = []
+    for symbol in requested:
+        if symbol in STABLECOINS:
+            results.append(_STABLE_DETAILS[symbol])
+        elif symbol in tickers:
+            results.append(_details_from_ticker(symbol, tickers[symbol]))
+        else:
+            not_found.append(symbol)
+    
+    return {"results": results, "notFound": not_found}
+
+
 @router.get("/{symbol}")
 async def get_crypto_details(symbol: str, current_user = Depends(get_current_user)):
     """
@@ -126,117 +342,78 @@ async def get_crypto_details(symbol: str, current_user = Depends(get_current_use
     """
     symbol = symbol.upper()
     
-    # Icon map for well-known coins
-    icon_map = {
-        "BTC": "https://assets.coingecko.com/coins/images/1/small/bitcoin.png",
-        "ETH": "https://assets.coingecko.com/coins/images/279/small/ethereum.png",
-        "USDT": "https://assets.coingecko.com/coins/images/325/small/Tether.png",
-        "BNB": "https://assets.coingecko.com/coins/images/825/small/bnb-icon2_2x.png",
-        "SOL": "https://assets.coingecko.com/coins/images/4128/small/solana.png",
-        "XRP": "https://assets.coingecko.com/coins/images/44/small/xrp-symbol-white-128.png",
-        "USDC": "https://assets.coingecko.com/coins/images/6319/small/usdc.png",
-        "ADA": "https://assets.coingecko.com/coins/images/975/small/cardano.png",
-        "AVAX": "https://assets.coingecko.com/coins/images/12559/small/Avalanche_Circle_RedWhite_Trans.png",
-        "DOGE": "https://assets.coingecko.com/coins/images/5/small/dogecoin.png",
-        "DOT": "https://assets.coingecko.com/coins/images/12171/small/polkadot.png",
-        "MATIC": "https://assets.coingecko.com/coins/images/4713/small/polygon.png",
-        "SHIB": "https://assets.coingecko.com/coins/images/11939/small/shiba.png",
-        "LTC": "https://assets.coingecko.com/coins/images/2/small/litecoin.png",
-        "LINK": "https://assets.coingecko.com/coins/images/877/small/chainlink-new-logo.png",
-    }
-    
     # Handle stablecoins specially (they don't have XXXUSDT pairs)
-    if symbol in ["USDT", "USDC", "DAI", "BUSD", "TUSD"]:
-        return {
-            "symbol": symbol,
-            "name": CRYPTO_NAMES.get(symbol, symbol),
-            "icon": icon_map.get(symbol, f"https://ui-avatars.com/api/?name={symbol}&background=1a1a1a&color=10b981&bold=true"),
-            "price": 1.00,
-            "priceChange": 0.00,
-            "priceChangePercent": 0.00,
-            "high24h": 1.001,
-            "low24h": 0.999,
-            "open24h": 1.00,
-            "volume": 0,
-            "quoteVolume": 0,
-            "bidPrice": 1.00,
-            "askPrice": 1.00,
-            "tradeCount": 0,
-            "weightedAvgPrice": 1.00,
-            "isStablecoin": True
-        }
+    if symbol in STABLECOINS:
+        return _STABLE_DETAILS[symbol]
+    
+    details = _ticker_mem.get(symbol)
+    if details is not None:
+        return details
     
     trading_pair = f"{symbol}USDT"
     url = f"https://api.binance.com/api/v3/ticker/24hr?symbol={trading_pair}"
     
-    try:
-        async with httpx.AsyncClient() as client:
-            response = await client.get(url, timeout=10.0)
+    async with fill_lock(f"ticker:{symbol}"):
+        details = _ticker_mem.get(symbol)
+        if details is not None:
+            return details
+        
+        try:
+            client = get_http_client()
+            response = await client.get(url, timeout=HTTP_TIMEOUTS["ticker/24hr"])
             
             if response.status_code == 400:
                 raise HTTPException(status_code=404, detail=f"Cryptocurrency {symbol} not found")
             
             response.raise_for_status()
-            data = response.json()
-            
-            return {
-                "symbol": symbol,
-                "name": CRYPTO_NAMES.get(symbol, symbol),
-                "icon": icon_map.get(symbol, f"https://ui-avatars.com/api/?name={symbol}&background=1a1a1a&color=10b981&bold=true"),
-                
-                # Price Data
-                "price": float(data["lastPrice"]),
-                "priceChange": float(data["priceChange"]),
-                "priceChangePercent": float(data["priceChangePercent"]),
-                
-                # 24h Range
-                "high24h": float(data["highPrice"]),
-                "low24h": float(data["lowPrice"]),
-                "open24h": float(data["openPrice"]),
-                
-                # Volume
-                "volume": float(data["volume"]),
-                "quoteVolume": float(data["quoteVolume"]),
+            details = _details_from_ticker(symbol, orjson.loads(response.content))
+            _ticker_mem[symbol] = details
+            return details
                 
-                # Order Book
-                "bidPrice": float(data["bidPrice"]),
-                "askPrice": float(data["askPrice"]),
-                
-                # Trade Stats
-                "tradeCount": int(data["count"]),
-                
-                # Weighted Average
-                "weightedAvgPrice": float(data["weightedAvgPrice"]),
-            }
-            
-    except httpx.TimeoutException:
-        raise HTTPException(status_code=504, detail="Binance API timeout")
-    except httpx.HTTPError as e:
-        raise HTTPException(status_code=502, detail=f"Binance API error: {str(e)}")
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=f"Failed to fetch crypto data: {str(e)}")
+        except httpx.TimeoutException:
+            raise HTTPException(status_code=504, detail="Binance API timeout")
+        except httpx.HTTPError as e:
+            raise HTTPException(status_code=502, detail=f"Binance API error: {str(e)}")
+        except Exception as e:
+            raise HTTPException(status_code=500, detail=f"Failed to fetch crypto data: {str(e)}")
 
 
 @router.get("/{symbol}/forecast")
-async def get_crypto_forecast(symbol: str, current_user = Depends(get_current_user)):
+async def get_crypto_forecast(
+    symbol: str,
+    current_user = Depends(get_current_user),
+    db: AsyncIOMotorDatabase = Depends(get_database)
+):
     """
     Get 7-day price forecast for a cryptocurrency.
     Uses historical data from Binance and Prophet/linear extrapolation for prediction.
+    Results are cached per symbol and UTC day: in process for 10 minutes and in
+    MongoDB for an hour.
     """
     symbol = symbol.upper()
     
     # Handle stablecoins - always $1
-    if symbol in ["USDT", "USDC", "DAI", "BUSD", "TUSD"]:
-        return {
-            "symbol": symbol,
-            "currentPrice": 1.00,
-            "predictedPrice": 1.00,
-            "changePercent": 0.0,
-            "forecast": [1.00, 1.00, 1.00, 1.00, 1.00, 1.00, 1.00],
-            "labels": ["Mon", "Tue", "Wed", "Thu", "Fri", "Sat", "Sun"],
-            "historicalPrices": [1.00, 1.00, 1.00, 1.00, 1.00, 1.00, 1.00],
-            "isStablecoin": True
-        }
+    if symbol in STABLECOINS:
+        return _STABLE_FORECASTS[symbol]
+    
+    # Daily klines roll over at midnight UTC, so cached forecasts are per day
+    now = datetime.utcnow()
+    day = now.date().isoformat()
+    result = _forecast_mem.get((symbol, day))
+    if result is not None:
+        return result
+    
+    result = await db.forecast_cache.find_one(
+        {
+            "_id": symbol,
+            "date": day,
+            "fetched_at": {"$gt": now - timedelta(seconds=FORECAST_CACHE_TTL)},
+        },
+        {"_id": 0, "date": 0, "fetched_at": 0},
+    )
+    if result is not None:
+        _forecast_mem[(symbol, day)] = result
+        return result
     
     trading_pair = f"{symbol}USDT"
     
@@ -245,63 +422,60 @@ async def get_crypto_forecast(symbol: str, current_user = Depends(get_current_us
     url = f"https://api.binance.com/api/v3/klines?symbol={trading_pair}&interval=1d&limit=30"
     
     try:
-        async with httpx.AsyncClient() as client:
-            response = await client.get(url, timeout=10.0)
-            
-            if response.status_code == 400:
-                raise HTTPException(status_code=404, detail=f"Cryptocurrency {symbol} not found")
-            
-            response.raise_for_status()
-            klines = response.json()
-            
-            # Extract closing prices from klines
-            # Kline format: [open_time, open, high, low, close, volume, ...]
-            prices = [float(k[4]) for k in klines]  # Index 4 is close price
-            
-            if len(prices) < 7:
-                raise HTTPException(status_code=400, detail="Insufficient historical data for forecast")
-            
-            # Import forecasting function
-            from ..intelligence.forecast import generate_forecast
-            
-            # Generate 7-day forecast
-            forecast = generate_forecast(prices, days=7)
-            
-            current_price = prices[-1]
-            predicted_price = forecast[-1] if forecast else current_price
-            change_percent = ((predicted_price - current_price) / current_price) * 100 if current_price > 0 else 0
-            
-            return {
-                "symbol": symbol,
-                "currentPrice": current_price,
-                "predictedPrice": predicted_price,
-                "changePercent": round(change_percent, 2),
-                "forecast": forecast,
-                "labels": ["Mon", "Tue", "Wed", "Thu", "Fri", "Sat", "Sun"],
-                "historicalPrices": prices[-7:],  # Last 7 days for context
-            }
-            
+        client = get_http_client()
+        response = await client.get(url, timeout=HTTP_TIMEOUTS["klines"])
+        
+        if response.status_code == 400:
+            raise HTTPException(status_code=404, detail=f"Cryptocurrency {symbol} not found")
+        
+        response.raise_for_status()
+        klines = orjson.loads(response.content)
+        
+        # Extract closing prices from klines
+        # Kline format: [open_time, open, high, low, close, volume, ...]
+        prices = [float(k[4]) for k in klines]  # Index 4 is close price
+        
+        if len(prices) < 7:
+            raise HTTPException(status_code=400, detail="Insufficient historical data for forecast")
+        
+        # Import forecasting function
+        from ..intelligence.forecast import generate_forecast
+        
+        # Generate 7-day forecast in the threadpool; model fitting is CPU-bound
+        forecast = await run_in_threadpool(generate_forecast, prices, 7)
+        
+        current_price = prices[-1]
+        predicted_price = forecast[-1] if forecast else current_price
+        change_percent = ((predicted_price - current_price) / current_price) * 100 if current_price > 0 else 0
+        
+        result = {
+            "symbol": symbol,
+            "currentPrice": current_price,
+            "predictedPrice": predicted_price,
+            "changePercent": round(change_percent, 2),
+            "forecast": forecast,
+            "labels": ["Mon", "Tue", "Wed", "Thu", "Fri", "Sat", "Sun"],
+            "historicalPrices": prices[-7:],  # Last 7 days for context
+        }
+        
+        # Cache in MongoDB (pruned by a TTL index on fetched_at) and in process
+        await db.forecast_cache.update_one(
+            {"_id": symbol},
+            {"$set": {**result, "date": day, "fetched_at": datetime.utcnow()}},
+            upsert=True
+        )
+        _forecast_mem[(symbol, day)] = result
+        
+        return result
+        
     except HTTPException:
         raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Failed to generate forecast: {str(e)}")
 
 
-@router.get("/{symbol}/news/status")
-async def get_news_cache_status(
-    symbol: str, 
-    current_user = Depends(get_current_user),
-    db: AsyncIOMotorDatabase = Depends(get_database)
-):
-    """
-    Check if cached news exists for this cryptocurrency.
-    Returns cache status without making any API calls.
-    """
-    symbol = symbol.upper()
-    
-    # Check for cached news
-    cached = await db.news_cache.find_one({"symbol": symbol})
-    
+def _news_cache_status(symbol: str, cached: Optional[dict]) -> dict:
+    """Cache freshness fields for a news_cache document (or None)."""
     if cached:
         fetched_at = cached.get("fetched_at")
         article_count = len(cached.get("articles", []))
@@ -330,6 +504,27 @@ async def get_news_cache_status(
     }
 
 
+@router.get("/{symbol}/news/status")
+async def get_news_cache_status(
+    symbol: str, 
+    current_user = Depends(get_current_user),
+    db: AsyncIOMotorDatabase = Depends(get_database)
+):
+    """
+    Check if cached news exists for this cryptocurrency.
+    Returns cache status without making any API calls.
+    Deprecated: GET /{symbol}/news now includes the same status fields.
+    """
+    symbol = symbol.upper()
+    
+    # Only metadata is needed here, so the article text is left in Mongo
+    cached = await db.news_cache.find_one(
+        {"symbol": symbol},
+        {"articles.title": 0, "articles.description": 0}
+    )
+    return _news_cache_status(symbol, cached)
+
+
 @router.get("/{symbol}/news")
 async def get_cached_news(
     symbol: str, 
@@ -337,7 +532,8 @@ async def get_cached_news(
     db: AsyncIOMotorDatabase = Depends(get_database)
 ):
     """
-    Get cached news for a cryptocurrency.
+    Get cached news for a cryptocurrency, along with the cache status fields
+    (has_cache, is_expired, article_count, age_hours).
     Does NOT make any API calls - only returns cached data.
     """
     symbol = symbol.upper()
@@ -345,10 +541,11 @@ async def get_cached_news(
     
     # Get cached news
     cached = await db.news_cache.find_one({"symbol": symbol})
+    status = _news_cache_status(symbol, cached)
     
     if cached and cached.get("articles"):
         return {
-            "symbol": symbol,
+            **status,
             "name": crypto_name,
             "articles": cached.get("articles", []),
             "fetched_at": cached.get("fetched_at").isoformat() if cached.get("fetched_at") else None,
@@ -357,7 +554,7 @@ async def get_cached_news(
     
     # No cache found
     return {
-        "symbol": symbol,
+        **status,
         "name": crypto_name,
         "articles": [],
         "fetched_at": None,
@@ -384,10 +581,10 @@ async def fetch_fresh_news(
         from ..intelligence.news_agent import fetch_market_news
         
         # Fetch news from API
-        articles = fetch_market_news(query=crypto_name)
+        articles = await fetch_market_news(query=crypto_name)
         
         if not articles:
-            articles = fetch_market_news(query=symbol)
+            articles = await fetch_market_news(query=symbol)
         
         # Format articles (without AI summary - that's on-demand)
         formatted_articles = []
@@ -401,14 +598,15 @@ async def fetch_fresh_news(
             })
         
         # Cache in MongoDB
+        fetched_at = datetime.utcnow()
         await db.news_cache.update_one(
             {"symbol": symbol},
             {
+                # symbol comes from the filter on insert; the name never changes
+                "$setOnInsert": {"crypto_name": crypto_name},
                 "$set": {
-                    "symbol": symbol,
-                    "crypto_name": crypto_name,
                     "articles": formatted_articles,
-                    "fetched_at": datetime.utcnow()
+                    "fetched_at": fetched_at
                 }
             },
             upsert=True
@@ -418,7 +616,7 @@ async def fetch_fresh_news(
             "symbol": symbol,
             "name": crypto_name,
             "articles": formatted_articles,
-            "fetched_at": datetime.utcnow().isoformat(),
+            "fetched_at": fetched_at.isoformat(),
             "from_cache": False,
             "message": "Fresh news fetched and cached for 24 hours."
         }
@@ -446,10 +644,12 @@ async def summarize_crypto_news(
     crypto_name = CRYPTO_NAMES.get(symbol, symbol)
     
     try:
-        from ..intelligence.news_agent import summarize_articles
+        from ..intelligence.news_agent import summarize_articles_async
         
-        # Get cached articles from MongoDB
-        cached = await db.news_cache.find_one({"symbol": symbol})
+        # Get cached articles from MongoDB (only the five that get summarized)
+        cached = await db.news_cache.find_one(
+            {"symbol": symbol}, {"_id": 0, "articles": {"$slice": 5}}
+        )
         
         if not cached or not cached.get("articles"):
             return {
@@ -460,7 +660,7 @@ async def summarize_crypto_news(
         articles = cached.get("articles", [])
         
         # Generate AI summary using Gemini
-        summary = summarize_articles(articles[:5])
+        summary = await summarize_articles_async(articles[:5])
         
         return {
             "symbol": symbol,
@@ -1,8 +1,13 @@
 from fastapi import APIRouter, HTTPException, Query
+from fastapi.concurrency import run_in_threadpool
 from typing import List, Optional
+import logging
+import numpy as np
 import yfinance as yf
 from ..intelligence.forecast import generate_forecast
-from ..intelligence.news_agent import fetch_market_news, summarize_articles
+from ..intelligence.news_agent import fetch_market_news, summarize_articles_async
+
+logger = logging.getLogger(__name__)
 
 router = APIRouter(
     prefix="/intelligence",
@@ -10,21 +15,26 @@ router = APIRouter(
     responses={404: {"description": "Not found"}},
 )
 
-@router.get("/forecast/{symbol}")
-async def get_forecast(symbol: str, days: int = 7):
+def _fetch_history(symbol: str):
     # Adjust symbol for yfinance (assuming crypto)
     # Most common crypto tickers on Yahoo Finance format: BTC-USD, ETH-USD
     ticker_symbol = f"{symbol.upper()}-USD"
     
-    try:
-        # Fetch 6 months of data
-        ticker = yf.Ticker(ticker_symbol)
+    # Fetch 6 months of data
+    ticker = yf.Ticker(ticker_symbol)
+    hist = ticker.history(period="6mo")
+    
+    if hist.empty:
+        # Fallback for standard tickers or try without -USD if needed
+        ticker = yf.Ticker(symbol.upper())
         hist = ticker.history(period="6mo")
-        
-        if hist.empty:
-            # Fallback for standard tickers or try without -USD if needed
-            ticker = yf.Ticker(symbol.upper())
-            hist = ticker.history(period="6mo")
+    return hist
+
+@router.get("/forecast/{symbol}")
+async def get_forecast(symbol: str, days: int = 7):
+    try:
+        # yfinance does blocking network I/O and pandas parsing; keep it off the event loop
+        hist = await run_in_threadpool(_fetch_history, symbol)
         
         if hist.empty:
              # Just return empty forecast instead of 404 to prevent UI crashes if yahoo fails
@@ -32,10 +42,11 @@ async def get_forecast(symbol: str, days: int = 7):
              # Let's throw 404 but with a clear message
              raise HTTPException(status_code=404, detail=f"No data found for symbol {symbol}")
              
-        prices = hist['Close'].tolist()
+        # float64 array straight from the frame; generate_forecast works on arrays
+        prices = hist['Close'].to_numpy(dtype=np.float64)
         
-        # Generate forecast
-        forecast_values = generate_forecast(prices, days)
+        # Generate forecast in the threadpool; model fitting is CPU-bound
+        forecast_values = await run_in_threadpool(generate_forecast, prices, days)
         
         # Prepare response
         return {
@@ -44,7 +55,7 @@ async def get_forecast(symbol: str, days: int = 7):
         }
         
     except Exception as e:
-        print(f"Error generating forecast: {e}")
+        logger.exception("Error generating forecast")
         # Return mock data for demo purposes if API fails?
         # For now, let's allow the error to bubble up
         raise HTTPException(status_code=500, detail=str(e))
@@ -54,10 +65,10 @@ async def get_news(coin: Optional[str] = Query(None)):
     try:
         query = coin if coin else "crypto"
         # Fetch news
-        articles = fetch_market_news(query=query)
+        articles = await fetch_market_news(query=query)
         
         # Generate AI summary
-        summary = summarize_articles(articles)
+        summary = await summarize_articles_async(articles)
         
         return {
             "symbol": coin,
@@ -65,5 +76,5 @@ async def get_news(coin: Optional[str] = Query(None)):
             "articles": articles
         }
     except Exception as e:
-        print(f"Error fetching news: {e}")
+        logger.exception("Error fetching news")
         raise HTTPException(status_code=500, detail=str(e))
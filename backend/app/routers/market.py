@@ -1,7 +1,7 @@
 from fastapi import APIRouter, HTTPException
 import httpx
-from typing import List
-import json
+from ..http_clients import HTTP_TIMEOUTS
+from ..services import binance_cache
 
 router = APIRouter()
 
@@ -20,6 +20,7 @@ TOP_CRYPTOS = [
     {"symbol": "LINKUSDT", "name": "Chainlink", "displaySymbol": "LINK"},
     {"symbol": "LTCUSDT", "name": "Litecoin", "displaySymbol": "LTC"}
 ]
+WANTED = {crypto["symbol"]: crypto for crypto in TOP_CRYPTOS}
 
 @router.get("/prices")
 async def get_crypto_prices():
@@ -28,40 +29,31 @@ async def get_crypto_prices():
     No API key required - free and unlimited for basic ticker data.
     """
     try:
-        async with httpx.AsyncClient() as client:
-            # Fetch all tickers at once (more efficient)
-            response = await client.get(
-                "https://api.binance.com/api/v3/ticker/24hr",
-                timeout=10.0
-            )
-            response.raise_for_status()
-            all_tickers = response.json()
-            
-            # Create a lookup map by symbol
-            price_map = {}
-            for item in all_tickers:
-                price_map[item["symbol"]] = {
+        # Fetch all tickers at once (more efficient); cached briefly across requests
+        all_tickers = await binance_cache.get_json(
+            "https://api.binance.com/api/v3/ticker/24hr",
+            binance_cache.price_cache,
+            timeout=HTTP_TIMEOUTS["ticker/24hr"]
+        )
+        
+        # Pick out just the tracked pairs in one pass over the ~2000 tickers
+        tickers = {item["symbol"]: item for item in all_tickers if item["symbol"] in WANTED}
+        
+        # Format response with crypto metadata, in TOP_CRYPTOS order
+        result = []
+        for crypto in TOP_CRYPTOS:
+            item = tickers.get(crypto["symbol"])
+            if item is not None:
+                result.append({
+                    "id": crypto["displaySymbol"].lower(),
+                    "symbol": crypto["displaySymbol"],
+                    "name": crypto["name"],
                     "price": float(item["lastPrice"]),
                     "change24h": float(item["priceChangePercent"])
-                }
-            
-            # Format response with crypto metadata
-            result = []
-            
-            # Add cryptos from the lookup
-            for crypto in TOP_CRYPTOS:
-                symbol = crypto["symbol"]
-                if symbol in price_map:
-                    result.append({
-                        "id": crypto["displaySymbol"].lower(),
-                        "symbol": crypto["displaySymbol"],
-                        "name": crypto["name"],
-                        "price": price_map[symbol]["price"],
-                        "change24h": price_map[symbol]["change24h"]
-                    })
-            
-            return result
-            
+                })
+        
+        return result
+        
     except httpx.TimeoutException:
         raise HTTPException(status_code=504, detail="Binance API timeout")
     except httpx.HTTPError as e:
@@ -1,13 +1,25 @@
 from fastapi import APIRouter, Depends, HTTPException
-from typing import List
+from typing import List, Optional
 from motor.motor_asyncio import AsyncIOMotorDatabase
 from ..database import get_database
 from ..models.portfolio import PortfolioItemCreate, PortfolioItemResponse, PortfolioItemInDB
 from ..models.user import UserInDB
 from .auth import get_current_user
 from ..services.auth_service import send_weekly_report_email
+from ..http_clients import HTTP_TIMEOUTS
+from ..services import binance_cache
+import asyncio
 import httpx
-from datetime import datetime, timedelta
+import json
+import logging
+
+# Binance requests a single report may have in flight at once
+PRICE_FETCH_CONCURRENCY = 10
+
+# Most symbols Binance accepts in one rolling-window ticker request
+WINDOW_TICKER_MAX_SYMBOLS = 100
+
+logger = logging.getLogger(__name__)
 
 router = APIRouter(
     prefix="/portfolio",
@@ -21,38 +33,78 @@ async def get_binance_7d_prices(symbol: str) -> dict:
     Returns dict with 'price_7d_ago' and 'current_price'.
     """
     try:
-        async with httpx.AsyncClient() as client:
-            # Get current price
-            ticker_url = f"https://api.binance.com/api/v3/ticker/price?symbol={symbol}USDT"
-            current_resp = await client.get(ticker_url, timeout=10)
-            
-            if current_resp.status_code != 200:
-                return None
-                
-            current_price = float(current_resp.json()["price"])
-            
-            # Get 7-day historical klines (1 day interval)
-            end_time = int(datetime.now().timestamp() * 1000)
-            start_time = int((datetime.now() - timedelta(days=7)).timestamp() * 1000)
-            
-            klines_url = f"https://api.binance.com/api/v3/klines?symbol={symbol}USDT&interval=1d&startTime={start_time}&endTime={end_time}&limit=7"
-            klines_resp = await client.get(klines_url, timeout=10)
-            
-            if klines_resp.status_code != 200 or not klines_resp.json():
-                return {"current_price": current_price, "price_7d_ago": current_price}
-            
-            klines = klines_resp.json()
-            # First kline's open price is the price 7 days ago
-            price_7d_ago = float(klines[0][1]) if klines else current_price
-            
-            return {
-                "current_price": current_price,
-                "price_7d_ago": price_7d_ago
+        # The last 8 daily klines: the first opens 7 days ago and the last one is
+        # today's still-open candle, whose close is the current price
+        klines_url = f"https://api.binance.com/api/v3/klines?symbol={symbol}USDT&interval=1d&limit=8"
+        klines = await binance_cache.get_json(
+            klines_url, binance_cache.klines_daily_cache, timeout=HTTP_TIMEOUTS["klines"]
+        )
+        if not klines:
+            return None
+        
+        return {
+            "current_price": float(klines[-1][4]),
+            "price_7d_ago": float(klines[0][1])
+        }
+    except httpx.HTTPStatusError:
+        # Unknown pair or Binance error status
+        return None
+    except Exception:
+        logger.exception("Error fetching Binance data for %s", symbol)
+        return None
+
+async def _get_binance_7d_window_prices(symbols: List[str]) -> Optional[dict]:
+    """
+    7-day prices for all symbols from one rolling-window ticker request: the window
+    opens exactly 7 days ago and its last price is the current one. Returns None if
+    the request fails (Binance rejects it outright if any pair is unknown).
+    """
+    pairs = [f"{symbol}USDT" for symbol in symbols]
+    try:
+        tickers = await binance_cache.get_json(
+            "https://api.binance.com/api/v3/ticker",
+            binance_cache.price_cache,
+            timeout=HTTP_TIMEOUTS["ticker"],
+            params={"symbols": json.dumps(pairs, separators=(",", ":")), "windowSize": "7d"},
+        )
+        return {
+            entry["symbol"][:-4]: {
+                "current_price": float(entry["lastPrice"]),
+                "price_7d_ago": float(entry["openPrice"])
             }
-    except Exception as e:
-        print(f"Error fetching Binance data for {symbol}: {e}")
+            for entry in tickers
+        }
+    except httpx.HTTPStatusError:
+        return None
+    except Exception:
+        logger.exception("Error fetching Binance 7d tickers")
         return None
 
+async def get_binance_7d_prices_many(symbols) -> dict:
+    """
+    7-day prices for several symbols. All of them come from a single rolling-window
+    ticker request when possible; otherwise get_binance_7d_prices runs per symbol
+    concurrently, at most PRICE_FETCH_CONCURRENCY requests in flight.
+    Returns {symbol: prices} for the symbols that could be fetched.
+    """
+    symbols = list(symbols)
+    if len(symbols) <= WINDOW_TICKER_MAX_SYMBOLS:
+        prices = await _get_binance_7d_window_prices(symbols)
+        if prices is not None:
+            return prices
+    
+    semaphore = asyncio.Semaphore(PRICE_FETCH_CONCURRENCY)
+    
+    async def fetch(symbol: str):
+        async with semaphore:
+            return await get_binance_7d_prices(symbol)
+    
+    results = await asyncio.gather(*(fetch(symbol) for symbol in symbols), return_exceptions=True)
+    return {
+        symbol: prices for symbol, prices in zip(symbols, results)
+        if prices and not isinstance(prices, BaseException)
+    }
+
 @router.get("/", response_model=List[PortfolioItemResponse])
 async def read_portfolio(current_user: UserInDB = Depends(get_current_user), db: AsyncIOMotorDatabase = Depends(get_database)):
     items = []
@@ -111,13 +163,15 @@ async def send_portfolio_report(current_user: UserInDB = Depends(get_current_use
     
     coin_performances = []
     
+    # Get prices from Binance, for all coins at once
+    price_map = await get_binance_7d_prices_many({item["coin_symbol"] for item in portfolio_items})
+    
     for item in portfolio_items:
         symbol = item["coin_symbol"]
         quantity = item["quantity"]
         buy_price = item["buy_price"]
         
-        # Get prices from Binance
-        prices = await get_binance_7d_prices(symbol)
+        prices = price_map.get(symbol)
         
         if not prices:
             continue
@@ -3,7 +3,7 @@ from motor.motor_asyncio import AsyncIOMotorDatabase
 from bson import ObjectId
 from ..database import get_database
 from ..models.user import UserInDB
-from .auth import get_current_user
+from .auth import get_current_user, invalidate_cached_user
 from pydantic import BaseModel
 
 class WatchlistItem(BaseModel):
@@ -20,27 +20,26 @@ async def get_watchlist(current_user: UserInDB = Depends(get_current_user)):
     # Handle case where user doesn't have watchlist field (older users)
     return current_user.watchlist if current_user.watchlist else []
 
+def _user_object_id(current_user: UserInDB) -> ObjectId:
+    # Convert string id back to ObjectId for MongoDB query
+    if not current_user.id:
+        raise HTTPException(status_code=400, detail="Invalid user ID")
+    return ObjectId(current_user.id)
+
+# $addToSet/$pull are idempotent, so the stored watchlist (not the possibly
+# cached copy on current_user) decides the outcome via modified_count
 @router.post("/add")
 async def add_to_watchlist(item: WatchlistItem, current_user: UserInDB = Depends(get_current_user), db: AsyncIOMotorDatabase = Depends(get_database)):
-    user_watchlist = current_user.watchlist or []
-    if item.symbol not in user_watchlist:
-        # Convert string id back to ObjectId for MongoDB query
-        user_id = ObjectId(current_user.id) if current_user.id else None
-        if not user_id:
-            raise HTTPException(status_code=400, detail="Invalid user ID")
-        await db.users.update_one({"_id": user_id}, {"$addToSet": {"watchlist": item.symbol}})
+    result = await db.users.update_one({"_id": _user_object_id(current_user)}, {"$addToSet": {"watchlist": item.symbol}})
+    if result.modified_count:
+        invalidate_cached_user(current_user.email)
         return {"message": f"Added {item.symbol} to watchlist", "action": "added", "item": item.symbol}
     return {"message": f"{item.symbol} already in watchlist", "action": "none", "item": item.symbol}
 
 @router.post("/remove")
 async def remove_from_watchlist(item: WatchlistItem, current_user: UserInDB = Depends(get_current_user), db: AsyncIOMotorDatabase = Depends(get_database)):
-    user_watchlist = current_user.watchlist or []
-    if item.symbol in user_watchlist:
-        # Convert string id back to ObjectId for MongoDB query
-        user_id = ObjectId(current_user.id) if current_user.id else None
-        if not user_id:
-            raise HTTPException(status_code=400, detail="Invalid user ID")
-        await db.users.update_one({"_id": user_id}, {"$pull": {"watchlist": item.symbol}})
+    result = await db.users.update_one({"_id": _user_object_id(current_user)}, {"$pull": {"watchlist": item.symbol}})
+    if result.modified_count:
+        invalidate_cached_user(current_user.email)
         return {"message": f"Removed {item.symbol} from watchlist", "action": "removed", "item": item.symbol}
     return {"message": f"{item.symbol} not in watchlist", "action": "none", "item": item.symbol}
-
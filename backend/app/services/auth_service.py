@@ -2,18 +2,68 @@ from passlib.context import CryptContext
 from datetime import datetime, timedelta
 from typing import Optional
 from jose import JWTError, jwt
-from ..config import settings
+from fastapi.concurrency import run_in_threadpool
+from ..config import get_settings
+from cachetools import TTLCache
+from email.mime.text import MIMEText
+from email.mime.multipart import MIMEMultipart
+import aiosmtplib
+import asyncio
+import hashlib
+import hmac
+import jinja2
+import logging
 import random
 import string
+import threading
+
+settings = get_settings()
+logger = logging.getLogger(__name__)
 
 pwd_context = CryptContext(schemes=["argon2"], deprecated="auto")
 
+# Recent successful verifications, so a user re-authenticating within a minute
+# skips another Argon2 round. Keys are keyed digests, never the plaintext
+VERIFY_CACHE_TTL = 60
+_verified: TTLCache = TTLCache(maxsize=1024, ttl=VERIFY_CACHE_TTL)
+_verified_lock = threading.Lock()
+
+def _verify_key(plain_password: str, hashed_password: str) -> bytes:
+    h = hashlib.blake2b(key=settings.SECRET_KEY.encode()[:64], digest_size=16)
+    h.update(plain_password.encode())
+    h.update(b"\0")
+    h.update(hashed_password.encode())
+    return h.digest()
+
+def _is_verified(key: bytes) -> bool:
+    with _verified_lock:
+        return bool(_verified.get(key))
+
+def _verify_and_remember(key: bytes, plain_password, hashed_password) -> bool:
+    ok = pwd_context.verify(plain_password, hashed_password)
+    if ok:
+        with _verified_lock:
+            _verified[key] = True
+    return ok
+
 def verify_password(plain_password, hashed_password):
-    return pwd_context.verify(plain_password, hashed_password)
+    key = _verify_key(plain_password, hashed_password)
+    return _is_verified(key) or _verify_and_remember(key, plain_password, hashed_password)
 
 def get_password_hash(password):
     return pwd_context.hash(password)
 
+# Argon2 is deliberately CPU-heavy; request handlers use these so hashing runs
+# in the threadpool instead of stalling the event loop
+async def verify_password_async(plain_password, hashed_password):
+    key = _verify_key(plain_password, hashed_password)
+    if _is_verified(key):
+        return True
+    return await run_in_threadpool(_verify_and_remember, key, plain_password, hashed_password)
+
+async def get_password_hash_async(password):
+    return await run_in_threadpool(get_password_hash, password)
+
 def create_access_token(data: dict, expires_delta: Optional[timedelta] = None):
     to_encode = data.copy()
     if expires_delta:
@@ -27,122 +77,136 @@ def create_access_token(data: dict, expires_delta: Optional[timedelta] = None):
 def generate_otp(length=6):
     return ''.join(random.choices(string.digits, k=length))
 
-import smtplib
-from email.mime.text import MIMEText
-from email.mime.multipart import MIMEMultipart
-from fastapi.concurrency import run_in_threadpool
+# OTPs are stored as an HMAC keyed with the app secret, so pending/reset documents
+# never hold the plaintext code and the 10^6 possible codes can't be brute-forced
+# from the digest without the key
+def hash_otp(otp: str) -> str:
+    return hmac.new(settings.SECRET_KEY.encode(), otp.encode(), hashlib.sha256).hexdigest()
 
-def send_email_sync(email_to: str, otp: str):
-    try:
-        msg = MIMEMultipart()
-        msg['From'] = settings.MAIL_FROM
-        msg['To'] = email_to
-        msg['Subject'] = "CryptoBeacon Verification Code"
+def otp_matches(stored_hash: str, otp: str) -> bool:
+    return hmac.compare_digest(stored_hash, hash_otp(otp))
+
+class SMTPSession:
+    """
+    One authenticated SMTP connection reused across sends. Connects lazily, checks
+    the link with NOOP before each message and reconnects if the server dropped it.
+    Sends through one session are serialised, so concurrent tasks may share it.
+    """
+
+    def __init__(self):
+        self._server: Optional[aiosmtplib.SMTP] = None
+        self._lock = asyncio.Lock()
+
+    async def _connect(self):
+        server = aiosmtplib.SMTP(hostname=settings.MAIL_SERVER, port=settings.MAIL_PORT, start_tls=True)
+        await server.connect()
+        await server.login(settings.MAIL_USERNAME, settings.MAIL_PASSWORD)
+        self._server = server
+
+    async def _ensure_connected(self):
+        if self._server is not None:
+            try:
+                if self._server.is_connected and (await self._server.noop()).code == 250:
+                    return
+            except (aiosmtplib.SMTPException, OSError):
+                pass
+            await self._close()
+        await self._connect()
+
+    async def sendmail(self, email_to: str, text: str):
+        async with self._lock:
+            try:
+                await self._ensure_connected()
+                try:
+                    await self._server.sendmail(settings.MAIL_FROM, email_to, text)
+                except aiosmtplib.SMTPServerDisconnected:
+                    # Dropped between NOOP and send: retry once on a fresh connection
+                    await self._close()
+                    await self._connect()
+                    await self._server.sendmail(settings.MAIL_FROM, email_to, text)
+            except Exception:
+                # Don't keep a connection in an unknown state around for the next send
+                await self._close()
+                raise
+
+    async def _close(self):
+        server, self._server = self._server, None
+        if server is not None:
+            try:
+                await server.quit()
+            except (aiosmtplib.SMTPException, OSError):
+                server.close()
 
-        body = f"""<html>
+    async def close(self):
+        async with self._lock:
+            await self._close()
+
+# Lazily opened connection shared by one-off emails (OTP, goodbye, on-demand report)
+_shared_session = SMTPSession()
+
+async def close_smtp_session():
+    await _shared_session.close()
+
+# Email bodies are compiled once at import; autoescape keeps user-supplied
+# values such as usernames from injecting markup
+_email_env = jinja2.Environment(autoescape=True)
+
+OTP_TEMPLATE = _email_env.from_string("""<html>
 <body style="font-family: Arial, sans-serif; color: #333;">
 <div style="max-width: 600px; margin: 0 auto; padding: 20px; border: 1px solid #ddd; border-radius: 8px;">
 <h2 style="color: #00ff88; text-align: center;">Verify Your Account</h2>
 <p>Hello,</p>
 <p>Thank you for registering with CryptoBeacon. Please use the following One-Time Password (OTP) to complete your verification:</p>
 <div style="background-color: #f5f5f5; padding: 15px; text-align: center; border-radius: 5px; font-size: 24px; letter-spacing: 5px; font-weight: bold; margin: 20px 0;">
-{otp}
+{{ otp }}
 </div>
 <p>This code will expire in 10 minutes.</p>
 <p>If you did not request this, please ignore this email.</p>
 <br>
 <p style="font-size: 12px; color: #888;">CryptoBeacon Team</p>
-<div style="display:none; color:transparent; font-size:1px;">Message ID: {datetime.utcnow().timestamp()}</div>
+<div style="display:none; color:transparent; font-size:1px;">Message ID: {{ message_id }}</div>
 </div>
 </body>
-</html>"""
-        msg.attach(MIMEText(body, 'html'))
-
-        server = smtplib.SMTP(settings.MAIL_SERVER, settings.MAIL_PORT)
-        server.starttls()
-        server.login(settings.MAIL_USERNAME, settings.MAIL_PASSWORD)
-        text = msg.as_string()
-        server.sendmail(settings.MAIL_FROM, email_to, text)
-        server.quit()
-        return True
-    except Exception as e:
-        print(f"Failed to send email: {e}")
-        return False
+</html>""")
 
-async def send_otp_email(email: str, otp: str):
-    return await run_in_threadpool(send_email_sync, email, otp)
-
-def send_goodbye_email_sync(email_to: str, username: str):
-    try:
-        msg = MIMEMultipart()
-        msg['From'] = settings.MAIL_FROM
-        msg['To'] = email_to
-        msg['Subject'] = "Goodbye from CryptoBeacon"
-
-        body = f"""<html>
+GOODBYE_TEMPLATE = _email_env.from_string("""<html>
 <body style="font-family: Arial, sans-serif; color: #333;">
 <div style="max-width: 600px; margin: 0 auto; padding: 20px; border: 1px solid #ddd; border-radius: 8px;">
 <h2 style="color: #ff4d4d; text-align: center;">Account Deleted</h2>
-<p>Hello {username},</p>
+<p>Hello {{ username }},</p>
 <p>Your CryptoBeacon account has been successfully deleted.</p>
 <p>All your personal data, portfolio, and watchlist have been permanently removed from our servers.</p>
 <p>We are sorry to see you go. If you ever change your mind, we'll be here!</p>
 <br>
 <p style="font-size: 12px; color: #888;">CryptoBeacon Team</p>
-<div style="display:none; color:transparent; font-size:1px;">Message ID: {datetime.utcnow().timestamp()}</div>
+<div style="display:none; color:transparent; font-size:1px;">Message ID: {{ message_id }}</div>
 </div>
 </body>
-</html>"""
-        msg.attach(MIMEText(body, 'html'))
-
-        server = smtplib.SMTP(settings.MAIL_SERVER, settings.MAIL_PORT)
-        server.starttls()
-        server.login(settings.MAIL_USERNAME, settings.MAIL_PASSWORD)
-        text = msg.as_string()
-        server.sendmail(settings.MAIL_FROM, email_to, text)
-        server.quit()
-        return True
-    except Exception as e:
-        print(f"Failed to send goodbye email: {e}")
-        return False
-
-async def send_goodbye_email(email: str, username: str):
-    return await run_in_threadpool(send_goodbye_email_sync, email, username)
+</html>""")
 
-def send_weekly_report_email_sync(email_to: str, username: str, report_data: dict):
-    try:
-        msg = MIMEMultipart()
-        msg['From'] = settings.MAIL_FROM
-        msg['To'] = email_to
-        msg['Subject'] = "Your Weekly CryptoBeacon Report"
-        
-        # Color for P/L
-        pl_color = "#00ff88" if report_data['total_pl'] >= 0 else "#ff4d4d"
-        pl_sign = "+" if report_data['total_pl'] >= 0 else ""
-
-        body = f"""<html>
+WEEKLY_REPORT_TEMPLATE = _email_env.from_string("""<html>
 <body style="font-family: Arial, sans-serif; color: #333;">
 <div style="max-width: 600px; margin: 0 auto; padding: 20px; border: 1px solid #ddd; border-radius: 8px;">
 <h2 style="color: #6366f1; text-align: center;">Weekly Portfolio Summary</h2>
-<p>Hello {username},</p>
+<p>Hello {{ username }},</p>
 <p>Here is your weekly update on your crypto portfolio.</p>
 
 <div style="background-color: #f9fafb; padding: 20px; border-radius: 8px; margin: 20px 0;">
 <div style="margin-bottom: 15px;">
 <span style="font-size: 14px; color: #666;">Total Portfolio Value</span><br>
-<span style="font-size: 24px; font-weight: bold;">${report_data['total_value']:,.2f}</span>
+<span style="font-size: 24px; font-weight: bold;">${{ "{:,.2f}".format(total_value) }}</span>
 </div>
 <div>
 <span style="font-size: 14px; color: #666;">Total Profit/Loss</span><br>
-<span style="font-size: 24px; font-weight: bold; color: {pl_color};">
-{pl_sign}${abs(report_data['total_pl']):,.2f} ({pl_sign}{report_data['pl_percent']:.2f}%)
+<span style="font-size: 24px; font-weight: bold; color: {{ pl_color }};">
+{{ pl_sign }}${{ "{:,.2f}".format(total_pl|abs) }} ({{ pl_sign }}{{ "%.2f"|format(pl_percent) }}%)
 </span>
 </div>
 </div>
 
 <h3 style="border-bottom: 1px solid #eee; padding-bottom: 5px;">Highlights</h3>
-<p><strong>Top Performer:</strong> {report_data['top_coin']} ({report_data['top_perf']}%)</p>
-<p><strong>Worst Performer:</strong> {report_data['worst_coin']} ({report_data['worst_perf']}%)</p>
+<p><strong>Top Performer:</strong> {{ top_coin }} ({{ top_perf }}%)</p>
+<p><strong>Worst Performer:</strong> {{ worst_coin }} ({{ worst_perf }}%)</p>
 
 <br>
 <div style="text-align: center;">
@@ -150,22 +214,57 @@ def send_weekly_report_email_sync(email_to: str, username: str, report_data: dic
 </div>
 <br>
 <p style="font-size: 12px; color: #888;">CryptoBeacon Team</p>
-<div style="display:none; color:transparent; font-size:1px;">Message ID: {datetime.utcnow().timestamp()}</div>
+<div style="display:none; color:transparent; font-size:1px;">Message ID: {{ message_id }}</div>
 </div>
 </body>
-</html>"""
-        msg.attach(MIMEText(body, 'html'))
-
-        server = smtplib.SMTP(settings.MAIL_SERVER, settings.MAIL_PORT)
-        server.starttls()
-        server.login(settings.MAIL_USERNAME, settings.MAIL_PASSWORD)
-        text = msg.as_string()
-        server.sendmail(settings.MAIL_FROM, email_to, text)
-        server.quit()
+</html>""")
+
+# Hidden per-message marker so mail clients don't collapse repeated emails
+# as quoted text
+def _message_id() -> float:
+    return datetime.utcnow().timestamp()
+
+async def _send_html(email_to: str, subject: str, html_body: str, session: Optional[SMTPSession] = None):
+    msg = MIMEMultipart()
+    msg['From'] = settings.MAIL_FROM
+    msg['To'] = email_to
+    msg['Subject'] = subject
+    msg.attach(MIMEText(html_body, 'html'))
+    await (session or _shared_session).sendmail(email_to, msg.as_string())
+
+async def send_otp_email(email_to: str, otp: str):
+    try:
+        body = OTP_TEMPLATE.render(otp=otp, message_id=_message_id())
+        await _send_html(email_to, "CryptoBeacon Verification Code", body)
         return True
-    except Exception as e:
-        print(f"Failed to send weekly report email: {e}")
+    except Exception:
+        logger.exception("Failed to send email")
         return False
 
-async def send_weekly_report_email(email: str, username: str, report_data: dict):
-    return await run_in_threadpool(send_weekly_report_email_sync, email, username, report_data)
+async def send_goodbye_email(email_to: str, username: str):
+    try:
+        body = GOODBYE_TEMPLATE.render(username=username, message_id=_message_id())
+        await _send_html(email_to, "Goodbye from CryptoBeacon", body)
+        return True
+    except Exception:
+        logger.exception("Failed to send goodbye email")
+        return False
+
+async def send_weekly_report_email(email_to: str, username: str, report_data: dict, session: Optional[SMTPSession] = None):
+    try:
+        # Color for P/L
+        pl_color = "#00ff88" if report_data['total_pl'] >= 0 else "#ff4d4d"
+        pl_sign = "+" if report_data['total_pl'] >= 0 else ""
+
+        body = WEEKLY_REPORT_TEMPLATE.render(
+            username=username,
+            pl_color=pl_color,
+            pl_sign=pl_sign,
+            message_id=_message_id(),
+            **report_data
+        )
+        await _send_html(email_to, "Your Weekly CryptoBeacon Report", body, session)
+        return True
+    except Exception:
+        logger.exception("Failed to send weekly report email")
+        return False
@@ -0,0 +1,39 @@
+from typing import Any, Optional
+
+import orjson
+from cachetools import TTLCache
+
+from ..http_clients import get_http_client
+from .locks import fill_lock
+
+# Binance ticker data is stable for tens of seconds and daily klines for minutes,
+# so bursts of identical requests are answered from memory
+PRICE_TTL = 45
+KLINES_DAILY_TTL = 600
+
+price_cache: TTLCache = TTLCache(maxsize=256, ttl=PRICE_TTL)
+klines_daily_cache: TTLCache = TTLCache(maxsize=256, ttl=KLINES_DAILY_TTL)
+
+
+async def get_json(url: str, cache: TTLCache, timeout: float, params: Optional[dict] = None) -> Any:
+    """
+    GET a Binance endpoint through the shared client and return the decoded JSON.
+    Successful responses are kept in `cache`; error statuses raise
+    httpx.HTTPStatusError and are never cached.
+    """
+    key = str(get_http_client().build_request("GET", url, params=params).url)
+    data = cache.get(key)
+    if data is not None:
+        return data
+    
+    # Concurrent misses for one URL share a single request
+    async with fill_lock(key):
+        data = cache.get(key)
+        if data is not None:
+            return data
+        
+        response = await get_http_client().get(key, timeout=timeout)
+        response.raise_for_status()
+        data = orjson.loads(response.content)
+        cache[key] = data
+        return data
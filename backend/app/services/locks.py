@@ -0,0 +1,13 @@
+import asyncio
+import weakref
+
+# One lock per cache key, so concurrent misses wait for a single fill instead of
+# all hitting the backend; entries disappear once no request holds them
+_fill_locks: "weakref.WeakValueDictionary[str, asyncio.Lock]" = weakref.WeakValueDictionary()
+
+
+def fill_lock(key: str) -> asyncio.Lock:
+    lock = _fill_locks.get(key)
+    if lock is None:
+        lock = _fill_locks[key] = asyncio.Lock()
+    return lock
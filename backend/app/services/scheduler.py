@@ -1,12 +1,23 @@
-import yfinance as yf
 from apscheduler.schedulers.asyncio import AsyncIOScheduler
 from apscheduler.triggers.cron import CronTrigger
 from apscheduler.jobstores.mongodb import MongoDBJobStore
 from pymongo import MongoClient
 from ..database import db
-from ..config import settings
-from .auth_service import send_weekly_report_email
+from ..config import get_settings
+from .auth_service import SMTPSession, send_weekly_report_email
+from . import binance_cache
+from ..http_clients import HTTP_TIMEOUTS
+from typing import List
 import asyncio
+import logging
+
+settings = get_settings()
+logger = logging.getLogger(__name__)
+
+# Users whose reports are built and sent at once, and the SMTP connections they
+# share; kept small so the mail provider doesn't throttle the batch
+REPORT_CONCURRENCY = 20
+REPORT_SMTP_CONNECTIONS = 4
 
 # Setup Persistent Job Store using standard PyMongo (APScheduler requirement)
 # This allows the scheduler to remember missed jobs across restarts.
@@ -16,56 +27,71 @@ jobstores = {
 
 scheduler = AsyncIOScheduler(jobstores=jobstores)
 
-async def get_current_price(symbol: str, price_cache: dict) -> float:
-    """Fetch price from yfinance with caching throughout the job execution."""
-    if symbol in price_cache:
-        return price_cache[symbol]
-    
-    try:
-        # Try crypto format first
-        ticker = yf.Ticker(f"{symbol}-USD")
-        history = ticker.history(period="1d")
-        
-        if history.empty:
-            # Try raw symbol
-            ticker = yf.Ticker(symbol)
-            history = ticker.history(period="1d")
-            
-        if not history.empty:
-            price = history['Close'].iloc[-1]
-            price_cache[symbol] = price
-            return price
-    except Exception as e:
-        print(f"Error fetching price for {symbol}: {e}")
-        
-    return 0.0
+async def fetch_price_table() -> dict:
+    """Last price of every USDT pair on Binance, keyed by pair (e.g. "BTCUSDT"), from one request."""
+    tickers = await binance_cache.get_json(
+        "https://api.binance.com/api/v3/ticker/price",
+        binance_cache.price_cache,
+        timeout=HTTP_TIMEOUTS["ticker/price"]
+    )
+    return {t["symbol"]: float(t["price"]) for t in tickers if t["symbol"].endswith("USDT")}
+
+def get_current_price(symbol: str, price_cache: dict) -> float:
+    """Look up a coin's USDT price in the table fetched once per job run."""
+    if symbol == "USDT":
+        return 1.0
+    return price_cache.get(f"{symbol}USDT", 0.0)
 
 async def weekly_report_job():
-    print("----- Starting Weekly Report Job -----")
-    database = db.get_db()
-    users_cursor = database.users.find({})
+    logger.info("----- Starting Weekly Report Job -----")
+    try:
+        price_cache = await fetch_price_table()
+    except Exception:
+        # Without prices every report would show a zero balance; skip this run instead
+        logger.exception("Error fetching prices for weekly report")
+        return
     
-    price_cache = {}
+    database = db.get_db()
+    # Each verified user with their portfolio embedded, in one round trip rather
+    # than a portfolio query per user. portfolio.user_id holds the stringified _id
+    users_cursor = database.users.aggregate([
+        {"$match": {"is_verified": True, "email": {"$nin": [None, ""]}}},
+        {"$project": {"email": 1, "username": 1, "id_str": {"$toString": "$_id"}}},
+        {"$lookup": {
+            "from": "portfolio",
+            "localField": "id_str",
+            "foreignField": "user_id",
+            "as": "portfolio",
+        }},
+        {"$match": {"portfolio": {"$ne": []}}},
+    ])
     
-    async for user in users_cursor:
+    # A few SMTP logins for the whole batch rather than one per recipient
+    smtp_sessions = [SMTPSession() for _ in range(REPORT_SMTP_CONNECTIONS)]
+    try:
+        await _send_weekly_reports(users_cursor, price_cache, smtp_sessions)
+    finally:
+        await asyncio.gather(*(session.close() for session in smtp_sessions))
+
+    logger.info("----- Weekly Report Job Completed -----")
+
+async def _send_weekly_reports(users_cursor, price_cache: dict, smtp_sessions: List[SMTPSession]):
+    # Users are processed concurrently, at most REPORT_CONCURRENCY at a time,
+    # spreading sends round-robin over the batch's SMTP connections
+    semaphore = asyncio.Semaphore(REPORT_CONCURRENCY)
+    users = await users_cursor.to_list(length=None)
+    await asyncio.gather(*(
+        _send_weekly_report(user, price_cache, smtp_sessions[i % len(smtp_sessions)], semaphore)
+        for i, user in enumerate(users)
+    ))
+
+async def _send_weekly_report(user: dict, price_cache: dict, smtp_session: SMTPSession, semaphore: asyncio.Semaphore):
+    async with semaphore:
         try:
-            if not user.get("is_verified"):
-                continue
-                
-            user_id = str(user["_id"])
-            email = user.get("email")
+            email = user["email"]
             username = user.get("username", "User")
+            portfolio_items = user["portfolio"]
             
-            if not email:
-                continue
-
-            # Fetch portfolio
-            portfolio_cursor = database.portfolio.find({"user_id": user_id})
-            portfolio_items = await portfolio_cursor.to_list(length=None)
-            
-            if not portfolio_items:
-                continue
-                
             total_value = 0.0
             total_cost = 0.0
             
@@ -76,7 +102,7 @@ async def weekly_report_job():
                 quantity = item["quantity"]
                 buy_price = item["buy_price"]
                 
-                current_price = await get_current_price(symbol, price_cache)
+                current_price = get_current_price(symbol, price_cache)
                 
                 # Calculate Values
                 item_value = current_price * quantity
@@ -125,13 +151,11 @@ async def weekly_report_job():
             }
             
             # Send Email
-            await send_weekly_report_email(email, username, report_data)
-            print(f"Sent weekly report to {email}")
+            await send_weekly_report_email(email, username, report_data, smtp_session)
+            logger.info("Sent weekly report to %s", email)
             
-        except Exception as e:
-            print(f"Error processing weekly report for user {user.get('_id')}: {e}")
-
-    print("----- Weekly Report Job Completed -----")
+        except Exception:
+            logger.exception("Error processing weekly report for user %s", user.get("_id"))
 
 def start_scheduler():
     # Run every Sunday at 9:00 AM
@@ -147,5 +171,5 @@ def start_scheduler():
         misfire_grace_time=None
     )
     scheduler.start()
-    print("Scheduler started (Persistent Mode with Coalesce).")
+    logger.info("Scheduler started (Persistent Mode with Coalesce).")
 
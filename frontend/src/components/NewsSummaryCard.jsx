@@ -11,47 +11,31 @@ const NewsSummaryCard = ({ symbol }) => {
     const [summarizing, setSummarizing] = useState(false);
     const token = localStorage.getItem('token');
 
-    // Check cache status on mount
+    // Load cached news and its cache status on mount (no API call)
     useEffect(() => {
-        const checkCacheStatus = async () => {
+        const loadCachedNews = async () => {
             try {
                 const response = await axios.get(
-                    `http://localhost:8000/crypto/${symbol}/news/status`,
+                    `http://localhost:8000/crypto/${symbol}/news`,
                     { headers: { Authorization: `Bearer ${token}` } }
                 );
                 setCacheStatus(response.data);
 
-                // If we have valid cache, load it
+                // Only show the cached articles while the cache is valid
                 if (response.data.has_cache && !response.data.is_expired) {
-                    loadCachedNews();
-                } else {
-                    setLoading(false);
+                    setArticles(response.data.articles || []);
                 }
             } catch (err) {
-                console.error('Failed to check cache status:', err);
-                setLoading(false);
+                console.error('Failed to load cached news:', err);
             }
+            setLoading(false);
         };
 
         if (token && symbol) {
-            checkCacheStatus();
+            loadCachedNews();
         }
     }, [symbol, token]);
 
-    // Load cached news (no API call)
-    const loadCachedNews = async () => {
-        try {
-            const response = await axios.get(
-                `http://localhost:8000/crypto/${symbol}/news`,
-                { headers: { Authorization: `Bearer ${token}` } }
-            );
-            setArticles(response.data.articles || []);
-        } catch (err) {
-            console.error('Failed to load cached news:', err);
-        }
-        setLoading(false);
-    };
-
     // Fetch fresh news (makes API call)
     const fetchFreshNews = async () => {
         setFetching(true);